@@ -5,19 +5,23 @@ from telegram.ext import ContextTypes, ConversationHandler
 
 from bot.utils.constants import *
 from bot.services.admin_service import AdminService
+from bot.handlers.middleware import current_role
 
 
 # =====================================================
 # ADMIN MANAGEMENT MENU
 # =====================================================
+# Static → built once and reused
+ADMIN_MENU = InlineKeyboardMarkup([
+    [InlineKeyboardButton(BTN_ADD_ADMIN, callback_data=CB_ADD_ADMIN)],
+    [InlineKeyboardButton(BTN_REMOVE_ADMIN, callback_data=CB_REMOVE_ADMIN)],
+    [InlineKeyboardButton(BTN_LIST_ADMINS, callback_data=CB_LIST_ADMINS)],
+    [InlineKeyboardButton(BTN_BACK_TO_MAIN, callback_data=CB_BACK_TO_MAIN)],
+])
+
+
 def build_admin_menu() -> InlineKeyboardMarkup:
-    keyboard = [
-        [InlineKeyboardButton(BTN_ADD_ADMIN, callback_data=CB_ADD_ADMIN)],
-        [InlineKeyboardButton(BTN_REMOVE_ADMIN, callback_data=CB_REMOVE_ADMIN)],
-        [InlineKeyboardButton(BTN_LIST_ADMINS, callback_data=CB_LIST_ADMINS)],
-        [InlineKeyboardButton(BTN_BACK_TO_MAIN, callback_data=CB_BACK_TO_MAIN)],
-    ]
-    return InlineKeyboardMarkup(keyboard)
+    return ADMIN_MENU
 
 
 # =====================================================
@@ -40,10 +44,9 @@ async def open_admin_management(update: Update, context: ContextTypes.DEFAULT_TY
         return ConversationHandler.END
 
     await query.answer()
-    admin_service: AdminService = context.bot_data["admin_service"]
 
-    # 🔐 Root-only access
-    if not admin_service.is_root(query.from_user.id):
+    # 🔐 Root-only access (role resolved once per update)
+    if current_role(context) != ROLE_ROOT:
         await query.edit_message_text("❌ Access denied.")
         return ConversationHandler.END
 
@@ -92,7 +95,7 @@ async def finalize_add_admin(update: Update, context: ContextTypes.DEFAULT_TYPE)
             return STATE_ADD_ADMIN_ID
 
     try:
-        admin_service.add_admin(
+        await admin_service.aadd_admin(
             telegram_id=telegram_id,
             username=username,
             added_by=update.effective_user.id,
@@ -138,12 +141,12 @@ async def finalize_remove_admin(update: Update, context: ContextTypes.DEFAULT_TY
         return STATE_REMOVE_ADMIN_SELECT
 
     # Safety: prevent root removal
-    if admin_service.is_root(telegram_id):
+    if await admin_service.ais_root(telegram_id):
         await update.message.reply_text("❌ Root admin cannot be removed.")
         return ConversationHandler.END
 
     try:
-        admin_service.disable_admin(telegram_id)
+        await admin_service.adisable_admin(telegram_id)
     except ValueError as e:
         await update.message.reply_text(f"⚠️ {e}")
         return ConversationHandler.END
@@ -168,7 +171,7 @@ async def list_admins(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await query.answer()
 
     admin_service: AdminService = context.bot_data["admin_service"]
-    admins = admin_service.get_active_admins()
+    admins = await admin_service.aget_active_admins()
 
     if not admins:
         text = "No active admins found."
@@ -185,3 +188,41 @@ async def list_admins(update: Update, context: ContextTypes.DEFAULT_TYPE):
         parse_mode="Markdown",
         reply_markup=build_admin_menu(),
     )
+
+
+# =====================================================
+# SHEETS API STATS (ROOT ONLY)
+# =====================================================
+async def sheets_stats(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """
+    /sheetstats [handler] → API calls per handler, busiest (handler, tab, op)
+    """
+    if current_role(context) != ROLE_ROOT:
+        await update.message.reply_text("❌ Access denied.")
+        return
+
+    metrics = getattr(context.bot_data["sheets"], "metrics", None)
+    if metrics is None:
+        await update.message.reply_text("No Sheets metrics for this storage backend.")
+        return
+
+    handler = context.args[0] if context.args else None
+    lines = ["📊 *Sheets API calls*\n"]
+
+    if not handler:
+        for name, calls in metrics.calls_by_handler().items():
+            lines.append(f"• `{name}`: {calls}")
+        lines.append("")
+
+    for row in metrics.snapshot(handler=handler)[:15]:
+        # Tab / op names contain "_": keep them inside the code span
+        lines.append(
+            f"`{row['handler']} {row['sheet'] or '-'} {row['op']}`: "
+            f"{row['calls']} calls, {row['errors']} err, "
+            f"avg {row['avg_ms']}ms, p95 ≤{row['p95_ms']}ms"
+        )
+
+    if len(lines) == 1:
+        lines.append("No calls recorded yet.")
+
+    await update.message.reply_text("\n".join(lines), parse_mode="Markdown")
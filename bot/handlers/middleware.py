@@ -0,0 +1,37 @@
+# Pre-dispatch middleware (runs before every other handler group)
+
+from telegram import Update
+from telegram.ext import ContextTypes
+
+from bot.utils.constants import ROLE_USER
+from bot.services.admin_service import AdminService
+from bot.utils.notify import AdminNotifier
+
+
+# =====================================================
+# ROLE RESOLUTION (ONCE PER UPDATE)
+# =====================================================
+async def resolve_role(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """
+    Stores the sender's role (user / admin / root) on the context.
+    The context object is shared by every handler of this update.
+    Also clears the sender from the notifier's unreachable list.
+    """
+    user = update.effective_user
+    if not user:
+        context.role = ROLE_USER
+        return
+
+    admin_service: AdminService = context.bot_data["admin_service"]
+    context.role = await admin_service.aget_role(user.id)
+
+    # Talking to the bot makes an admin reachable again
+    notifier: AdminNotifier = context.bot_data["notifier"]
+    notifier.mark_reachable(user.id)
+
+
+def current_role(context: ContextTypes.DEFAULT_TYPE) -> str:
+    """
+    Role resolved by the middleware for the current update.
+    """
+    return getattr(context, "role", ROLE_USER)
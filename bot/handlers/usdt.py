@@ -4,11 +4,10 @@ from telegram.ext import (
     ConversationHandler,
 )
 
-from telegram.error import BadRequest, Forbidden
-
 from bot.utils.constants import *
 from bot.services.order_service import OrderService
-from bot.services.admin_service import AdminService
+from bot.utils.notify import AdminNotifier
+from bot.handlers.middleware import current_role
 
 import re
 
@@ -62,7 +61,7 @@ async def collect_usdt_order_id(update: Update, context: ContextTypes.DEFAULT_TY
     order_id = update.message.text.strip()
     order_service: OrderService = context.bot_data["order_service"]
 
-    if not order_service.order_exists(order_id):
+    if not await order_service.aorder_exists(order_id):
         await update.message.reply_text(
             "❌ *Invalid Order ID*\n\nPlease enter a valid Order ID.",
             parse_mode="Markdown",
@@ -93,8 +92,8 @@ async def collect_usdt_subtotal(update: Update, context: ContextTypes.DEFAULT_TY
 
     settings_service = context.bot_data["settings_service"]
 
-    usdt_wallet = settings_service.get("USDT_WALLET")
-    fee_percent = settings_service.get("USDT_FEE_PERCENT", 3)
+    usdt_wallet = await settings_service.aget("USDT_WALLET")
+    fee_percent = await settings_service.aget("USDT_FEE_PERCENT", 3)
 
     if not usdt_wallet:
         await update.message.reply_text(
@@ -173,10 +172,9 @@ async def collect_usdt_txid(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return ConversationHandler.END
 
     order_service: OrderService = context.bot_data["order_service"]
-    admin_service: AdminService = context.bot_data["admin_service"]
 
     # ✅ Save USDT payment
-    order_service.create_usdt_payment({
+    await order_service.acreate_usdt_payment({
         "Order ID": order_id,
         "Subtotal USD": payment["Subtotal USD"],
         "USDT Fee USD": payment["USDT Fee USD"],
@@ -202,14 +200,18 @@ async def collect_usdt_txid(update: Update, context: ContextTypes.DEFAULT_TYPE):
         f"TXID:\n{txid}"
     )
 
-    for admin in admin_service.get_active_admins():
-        try:
-            await context.bot.send_message(
-                chat_id=int(admin["Telegram ID"]),
-                text=admin_message,
-            )
-        except (BadRequest, Forbidden):
-            continue
+    # Queued durably, delivered in the background: the reply does not wait
+    notifier: AdminNotifier = context.bot_data["notifier"]
+    await notifier.notify(
+        context.bot,
+        admin_message,
+        event={
+            "kind": "payment",
+            "order_id": order_id,
+            "chain": "USDT",
+            "total_usd": payment["Total USD"],
+        },
+    )
 
     from bot.handlers.user import build_main_menu
 
@@ -218,7 +220,7 @@ async def collect_usdt_txid(update: Update, context: ContextTypes.DEFAULT_TYPE):
         "Our admins will verify your transaction shortly.\n\n"
         "⬇️ What would you like to do next?",
         parse_mode="Markdown",
-        reply_markup=build_main_menu(user.id, admin_service),
+        reply_markup=build_main_menu(current_role(context)),
     )
 
     context.user_data.clear()
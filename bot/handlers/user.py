@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import (
     ContextTypes,
@@ -9,8 +11,9 @@ from telegram.ext import (
 )
 
 from bot.utils.constants import *
-from bot.services.admin_service import AdminService
+from bot.utils.notify import AdminNotifier
 from bot.services.order_service import OrderService
+from bot.handlers.middleware import current_role
 
 
 # =======================
@@ -41,92 +44,81 @@ from bot.handlers.usdt import (
 # =====================================================
 # MAIN MENU BUILDER
 # =====================================================
-def build_main_menu(user_id: int, admin_service: AdminService) -> InlineKeyboardMarkup:
-    keyboard = [
-        [InlineKeyboardButton(BTN_MEDIA_CHANNEL, url="https://t.me/+37NU62X0ftpiNDQx")],
-        [
-            InlineKeyboardButton(
-                BTN_SIGNAL_GROUP,
-                url="https://signal.group/#CjQKIJR_5Zmk1qdqfpASTNk_8ND1oWVWmZanqwErgpt83z6iEhCWUWPKmPTdjRgTWhSy5NSP",
-            ),
-            InlineKeyboardButton(
-                BTN_SIGNAL_DM,
-                url="https://signal.me/#eu/ddxqlF3A-LcvVwgcnNx0X01D13tM9AwNOJ16gmH_xiQ5evPTS8xEUKlZmkOo_Me4",
-            ),
-        ],
-        [InlineKeyboardButton(BTN_LIVE_MENU, callback_data=CB_LIVE_MENU)],
-        [
-            InlineKeyboardButton(BTN_HOW_TO_ORDER, callback_data=CB_HOW_TO_ORDER),
-            InlineKeyboardButton(BTN_SUBMIT_ORDER, callback_data=CB_SUBMIT_ORDER),
-        ],
-        [
-            InlineKeyboardButton(BTN_PAY_BTC, callback_data=CB_PAY_BTC),
-            InlineKeyboardButton(BTN_PAY_ETH, callback_data=CB_PAY_ETH),
-            InlineKeyboardButton(BTN_PAY_USDT, callback_data=CB_PAY_USDT),
-        ],
-        [
-            InlineKeyboardButton(BTN_ABOUT, callback_data=CB_ABOUT),
-            InlineKeyboardButton(BTN_SUPPORT, callback_data=CB_SUPPORT),
-        ],
-    ]
+# Keyboards are immutable, so static rows are built once at import
+# and shared by every menu; only payloads carrying an Order ID vary.
+_LINK_ROWS = (
+    (InlineKeyboardButton(BTN_MEDIA_CHANNEL, url="https://t.me/+37NU62X0ftpiNDQx"),),
+    (
+        InlineKeyboardButton(
+            BTN_SIGNAL_GROUP,
+            url="https://signal.group/#CjQKIJR_5Zmk1qdqfpASTNk_8ND1oWVWmZanqwErgpt83z6iEhCWUWPKmPTdjRgTWhSy5NSP",
+        ),
+        InlineKeyboardButton(
+            BTN_SIGNAL_DM,
+            url="https://signal.me/#eu/ddxqlF3A-LcvVwgcnNx0X01D13tM9AwNOJ16gmH_xiQ5evPTS8xEUKlZmkOo_Me4",
+        ),
+    ),
+    (InlineKeyboardButton(BTN_LIVE_MENU, callback_data=CB_LIVE_MENU),),
+    (
+        InlineKeyboardButton(BTN_HOW_TO_ORDER, callback_data=CB_HOW_TO_ORDER),
+        InlineKeyboardButton(BTN_SUBMIT_ORDER, callback_data=CB_SUBMIT_ORDER),
+    ),
+)
 
-    if admin_service.is_root(user_id):
-        keyboard.append(
-            [InlineKeyboardButton(BTN_ADMIN_MANAGEMENT, callback_data=CB_ADMIN_MANAGEMENT)]
-        )
+_PAY_ROW = (
+    InlineKeyboardButton(BTN_PAY_BTC, callback_data=CB_PAY_BTC),
+    InlineKeyboardButton(BTN_PAY_ETH, callback_data=CB_PAY_ETH),
+    InlineKeyboardButton(BTN_PAY_USDT, callback_data=CB_PAY_USDT),
+)
+
+_INFO_ROW = (
+    InlineKeyboardButton(BTN_ABOUT, callback_data=CB_ABOUT),
+    InlineKeyboardButton(BTN_SUPPORT, callback_data=CB_SUPPORT),
+)
+
+_ROOT_ROW = (
+    InlineKeyboardButton(BTN_ADMIN_MANAGEMENT, callback_data=CB_ADMIN_MANAGEMENT),
+)
 
+
+def _main_menu(pay_row, is_root: bool) -> InlineKeyboardMarkup:
+    keyboard = _LINK_ROWS + (pay_row, _INFO_ROW)
+    if is_root:
+        keyboard += (_ROOT_ROW,)
     return InlineKeyboardMarkup(keyboard)
 
 
+USER_MAIN_MENU = _main_menu(_PAY_ROW, is_root=False)
+ROOT_MAIN_MENU = _main_menu(_PAY_ROW, is_root=True)
+
+
+def build_main_menu(role: str) -> InlineKeyboardMarkup:
+    return ROOT_MAIN_MENU if role == ROLE_ROOT else USER_MAIN_MENU
+
+
+@lru_cache(maxsize=256)
 def build_order_submission_menu(order_id: str) -> InlineKeyboardMarkup:
     """Menu shown after order submission with payment options and Main Menu button"""
-    keyboard = [
-        [
-            InlineKeyboardButton(BTN_PAY_BTC, callback_data=CB_PAY_BTC),
-            InlineKeyboardButton(BTN_PAY_ETH, callback_data=CB_PAY_ETH),
-            InlineKeyboardButton(BTN_PAY_USDT, callback_data=CB_PAY_USDT),
-        ],
-        [InlineKeyboardButton("🏠 Main Menu", callback_data=f"{CB_BACK_TO_MAIN}:{order_id}")],
-    ]
+    keyboard = (
+        _PAY_ROW,
+        (InlineKeyboardButton("🏠 Main Menu", callback_data=f"{CB_BACK_TO_MAIN}:{order_id}"),),
+    )
     return InlineKeyboardMarkup(keyboard)
 
 
-def build_order_main_menu(user_id: int, admin_service: AdminService, order_id: str) -> InlineKeyboardMarkup:
+def build_order_main_menu(role: str, order_id: str) -> InlineKeyboardMarkup:
     """Main menu for users who just submitted an order (keeps order ID in context)"""
-    keyboard = [
-        [InlineKeyboardButton(BTN_MEDIA_CHANNEL, url="https://t.me/+37NU62X0ftpiNDQx")],
-        [
-            InlineKeyboardButton(
-                BTN_SIGNAL_GROUP,
-                url="https://signal.group/#CjQKIJR_5Zmk1qdqfpASTNk_8ND1oWVWmZanqwErgpt83z6iEhCWUWPKmPTdjRgTWhSy5NSP",
-            ),
-            InlineKeyboardButton(
-                BTN_SIGNAL_DM,
-                url="https://signal.me/#eu/ddxqlF3A-LcvVwgcnNx0X01D13tM9AwNOJ16gmH_xiQ5evPTS8xEUKlZmkOo_Me4",
-            ),
-        ],
-        [InlineKeyboardButton(BTN_LIVE_MENU, callback_data=CB_LIVE_MENU)],
-        [
-            InlineKeyboardButton(BTN_HOW_TO_ORDER, callback_data=CB_HOW_TO_ORDER),
-            InlineKeyboardButton(BTN_SUBMIT_ORDER, callback_data=CB_SUBMIT_ORDER),
-        ],
-        [
-            InlineKeyboardButton(BTN_PAY_BTC, callback_data=f"{CB_PAY_BTC}:{order_id}"),
-            InlineKeyboardButton(BTN_PAY_ETH, callback_data=f"{CB_PAY_ETH}:{order_id}"),
-            InlineKeyboardButton(BTN_PAY_USDT, callback_data=f"{CB_PAY_USDT}:{order_id}"),
-        ],
-        [
-            InlineKeyboardButton(BTN_ABOUT, callback_data=CB_ABOUT),
-            InlineKeyboardButton(BTN_SUPPORT, callback_data=CB_SUPPORT),
-        ],
-    ]
+    return _order_main_menu(role == ROLE_ROOT, order_id)
 
-    if admin_service.is_root(user_id):
-        keyboard.append(
-            [InlineKeyboardButton(BTN_ADMIN_MANAGEMENT, callback_data=CB_ADMIN_MANAGEMENT)]
-        )
 
-    return InlineKeyboardMarkup(keyboard)
+@lru_cache(maxsize=256)
+def _order_main_menu(is_root: bool, order_id: str) -> InlineKeyboardMarkup:
+    pay_row = (
+        InlineKeyboardButton(BTN_PAY_BTC, callback_data=f"{CB_PAY_BTC}:{order_id}"),
+        InlineKeyboardButton(BTN_PAY_ETH, callback_data=f"{CB_PAY_ETH}:{order_id}"),
+        InlineKeyboardButton(BTN_PAY_USDT, callback_data=f"{CB_PAY_USDT}:{order_id}"),
+    )
+    return _main_menu(pay_row, is_root)
 
 
 # =====================================================
@@ -134,7 +126,6 @@ def build_order_main_menu(user_id: int, admin_service: AdminService, order_id: s
 # =====================================================
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user = update.effective_user
-    admin_service: AdminService = context.bot_data["admin_service"]
     
     # Check if we're coming from an order submission context
     order_id = None
@@ -161,13 +152,13 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await update.message.reply_text(
             text,
             parse_mode="Markdown",
-            reply_markup=build_main_menu(user.id, admin_service),
+            reply_markup=build_main_menu(current_role(context)),
         )
     else:
         await update.callback_query.edit_message_text(
             text,
             parse_mode="Markdown",
-            reply_markup=build_order_main_menu(user.id, admin_service, order_id) if order_id else build_main_menu(user.id, admin_service),
+            reply_markup=build_order_main_menu(current_role(context), order_id) if order_id else build_main_menu(current_role(context)),
         )
 
 
@@ -244,7 +235,6 @@ async def finalize_order(update: Update, context: ContextTypes.DEFAULT_TYPE):
     context.user_data["carrier"] = update.message.text.strip()
 
     order_service: OrderService = context.bot_data["order_service"]
-    admin_service: AdminService = context.bot_data["admin_service"]
 
     # 🔥 FIX: DEFINE THESE
     telegram_username = f"@{user.username}" if user.username else "N/A"
@@ -253,10 +243,7 @@ async def finalize_order(update: Update, context: ContextTypes.DEFAULT_TYPE):
     # -------------------------
     # CREATE ORDER
     # -------------------------
-    order_id = order_service.generate_next_order_id()
-
     order_payload = {
-        "Order ID": order_id,
         "Telegram ID": str(user.id),
         "Telegram Username": telegram_username,
         "Telegram Name": telegram_name,
@@ -268,7 +255,8 @@ async def finalize_order(update: Update, context: ContextTypes.DEFAULT_TYPE):
         "Status": "Pending Payment",
     }
 
-    order_service.create_order(order_payload)
+    # ID generation + append run under one lock (concurrent updates)
+    order_id = await order_service.aplace_order(order_payload)
 
     # -------------------------
     # NOTIFY ADMINS (SAFE)
@@ -283,20 +271,14 @@ async def finalize_order(update: Update, context: ContextTypes.DEFAULT_TYPE):
     f"📝 Order Details:\n{order_payload['Order Text']}"
 )
 
-
-    admins = admin_service.get_active_admins()
-
-    for admin in admins:
-        admin_id = admin.get("Telegram ID")
-        try:
-            await context.bot.send_message(
-                chat_id=int(admin_id),
-                text=admin_message,
-                parse_mode="Markdown",
-            )
-        except Exception:
-            # Admin may not have started the bot – ignore safely
-            continue
+    # Queued durably, delivered in the background: the reply does not wait
+    notifier: AdminNotifier = context.bot_data["notifier"]
+    await notifier.notify(
+        context.bot,
+        admin_message,
+        parse_mode="Markdown",
+        event={"kind": "order", "order_id": order_id},
+    )
 
     # -------------------------
     # CONFIRM USER WITH PAYMENT OPTIONS AND ORDER ID
@@ -411,8 +393,6 @@ async def how_to_order(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
     await query.answer()
 
-    admin_service: AdminService = context.bot_data["admin_service"]
-
     text = (
         "📖 *How to Submit an Order*\n\n"
         "1️⃣ Tap *Submit Order*\n"
@@ -426,7 +406,7 @@ async def how_to_order(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await query.edit_message_text(
         text=text,
         parse_mode="Markdown",
-        reply_markup=build_main_menu(query.from_user.id, admin_service),
+        reply_markup=build_main_menu(current_role(context)),
     )
 
 
@@ -436,9 +416,8 @@ async def show_live_menu(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await query.answer()
 
     menu_service = context.bot_data["menu_service"]
-    admin_service: AdminService = context.bot_data["admin_service"]
 
-    blocks = menu_service.get_menu_text_blocks()
+    blocks = await menu_service.aget_menu_text_blocks()
 
     # Determine which menu to show based on context
     order_id = None
@@ -454,7 +433,7 @@ async def show_live_menu(update: Update, context: ContextTypes.DEFAULT_TYPE):
                         continue
     
     # Edit original message with first block
-    reply_markup = build_order_main_menu(query.from_user.id, admin_service, order_id) if order_id else build_main_menu(query.from_user.id, admin_service)
+    reply_markup = build_order_main_menu(current_role(context), order_id) if order_id else build_main_menu(current_role(context))
     
     await query.edit_message_text(
         blocks[0],
@@ -475,13 +454,11 @@ async def show_about(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
     await query.answer()
 
-    admin_service: AdminService = context.bot_data["admin_service"]
-
     await query.edit_message_text(
         "ℹ️ *About / Rules*\n\n"
         "This bot is used for directing traffic, showing Menu and taking shipped orders",
         parse_mode="Markdown",
-        reply_markup=build_main_menu(query.from_user.id, admin_service),
+        reply_markup=build_main_menu(current_role(context)),
     )
 
 
@@ -489,14 +466,12 @@ async def show_support(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
     await query.answer()
 
-    admin_service: AdminService = context.bot_data["admin_service"]
-
     await query.edit_message_text(
         "🆘 *Support*\n\n"
         "To Get Verified Please send a Verification Video with Packs or Bags and DC written on a Paper to @DCLA\\_Orders\n\n"
         "To contact admin message @DCLA\\_Orders or Tap the Signal DM Link.",
         parse_mode="Markdown",
-        reply_markup=build_main_menu(query.from_user.id, admin_service),
+        reply_markup=build_main_menu(current_role(context)),
     )
 
 # =====================================================
@@ -507,7 +482,6 @@ async def handle_back_to_main(update: Update, context: ContextTypes.DEFAULT_TYPE
     await query.answer()
     
     user = query.from_user
-    admin_service: AdminService = context.bot_data["admin_service"]
     
     # Extract order ID from callback data
     order_id = None
@@ -529,7 +503,7 @@ async def handle_back_to_main(update: Update, context: ContextTypes.DEFAULT_TYPE
     await query.edit_message_text(
         text,
         parse_mode="Markdown",
-        reply_markup=build_order_main_menu(user.id, admin_service, order_id) if order_id else build_main_menu(user.id, admin_service),
+        reply_markup=build_order_main_menu(current_role(context), order_id) if order_id else build_main_menu(current_role(context)),
     )
 
 # =====================================================
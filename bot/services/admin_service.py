@@ -1,24 +1,101 @@
-from typing import List, Dict, Optional
+import threading
+import time
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 
+from bot.services.sheets_scheduler import PRIORITY_BACKGROUND, sheets_priority
+from bot.utils.constants import ROLE_ADMIN, ROLE_ROOT, ROLE_USER
+
 
 class AdminService:
     """
     Admin & Root Admin RBAC logic.
     Uses Google Sheet `Admins`
+    - Rows are kept in memory with a Telegram ID → (type, status)
+      index, re-read from the sheet every `cache_ttl` seconds
+    - add_admin / disable_admin update the index right away
     """
 
     SHEET_NAME = "Admins"
 
-    def __init__(self, sheets, emergency_root_id: Optional[str]):
+    def __init__(
+        self,
+        sheets,
+        emergency_root_id: Optional[str],
+        cache_ttl: float = 60.0,
+    ):
         self.sheets = sheets
         self.emergency_root_id = int(emergency_root_id) if emergency_root_id else None
 
+        # RBAC index (cache_ttl = 0 → read the sheet on every check)
+        self.cache_ttl = cache_ttl
+        self._rows: List[Dict] = []
+        self._index: Dict[str, Tuple[str, str]] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.RLock()
+
     # =====================================================
     # INTERNAL HELPERS
     # =====================================================
+    def _is_fresh(self) -> bool:
+        with self._lock:
+            return (
+                self._loaded_at is not None
+                and time.monotonic() - self._loaded_at < self.cache_ttl
+            )
+
     def _read_all_rows(self) -> List[Dict]:
-        return self.sheets.read_sheet(self.SHEET_NAME) or []
+        if self._is_fresh():
+            with self._lock:
+                return self._rows
+
+        rows = self.sheets.read_sheet(self.SHEET_NAME) or []
+        self.prime(rows)
+        return rows
+
+    def _build_index(self, rows: List[Dict]) -> Dict[str, Tuple[str, str]]:
+        index: Dict[str, Tuple[str, str]] = {}
+
+        for row in rows:
+            key = str(row.get("Telegram ID")).strip()
+            entry = (self._get_type(row), self._normalize(row.get("Status", "")))
+
+            # Several rows per ID (re-added admins): active beats
+            # inactive, root beats admin
+            current = index.get(key)
+            if current is None or self._rank(entry) > self._rank(current):
+                index[key] = entry
+
+        return index
+
+    @staticmethod
+    def _rank(entry: Tuple[str, str]) -> Tuple[bool, bool]:
+        role, status = entry
+        return (status == "active", role == "root")
+
+    def _lookup(self, telegram_id: int) -> Optional[Tuple[str, str]]:
+        self._read_all_rows()
+        with self._lock:
+            return self._index.get(str(telegram_id).strip())
+
+    def prime(self, rows: List[Dict]) -> None:
+        """
+        Loads already fetched Admins rows (e.g. from the startup warm-up).
+        """
+        rows = list(rows or [])
+        index = self._build_index(rows)
+
+        with self._lock:
+            self._rows = rows
+            self._index = index
+            self._loaded_at = time.monotonic()
+
+    def invalidate(self) -> None:
+        """
+        Forces a re-read of the Admins tab on the next check.
+        """
+        with self._lock:
+            self._loaded_at = None
 
     def _normalize(self, value) -> str:
         return str(value).strip().lower()
@@ -37,31 +114,33 @@ class AdminService:
         if self.emergency_root_id and telegram_id == self.emergency_root_id:
             return True
 
-        for row in self._read_all_rows():
-            if (
-                str(row.get("Telegram ID")) == str(telegram_id)
-                and self._get_type(row) == "root"
-                and self._is_active(row)
-            ):
-                return True
-
-        return False
+        return self._lookup(telegram_id) == ("root", "active")
 
     # =====================================================
     # ADMIN CHECK
     # =====================================================
     def is_admin(self, telegram_id: int) -> bool:
-        if self.is_root(telegram_id):
+        if self.emergency_root_id and telegram_id == self.emergency_root_id:
             return True
 
-        for row in self._read_all_rows():
-            if (
-                str(row.get("Telegram ID")) == str(telegram_id)
-                and self._is_active(row)
-            ):
-                return True
+        entry = self._lookup(telegram_id)
+        return entry is not None and entry[1] == "active"
 
-        return False
+    # =====================================================
+    # ROLE (ONE LOOKUP)
+    # =====================================================
+    def get_role(self, telegram_id: int) -> str:
+        """
+        ROLE_ROOT / ROLE_ADMIN / ROLE_USER for a Telegram ID.
+        """
+        if self.emergency_root_id and telegram_id == self.emergency_root_id:
+            return ROLE_ROOT
+
+        entry = self._lookup(telegram_id)
+        if entry is None or entry[1] != "active":
+            return ROLE_USER
+
+        return ROLE_ROOT if entry[0] == "root" else ROLE_ADMIN
 
     # =====================================================
     # LIST ADMINS
@@ -81,6 +160,7 @@ class AdminService:
     # =====================================================
     # ADD ADMIN (✅ FIXED)
     # =====================================================
+    @sheets_priority(PRIORITY_BACKGROUND)
     def add_admin(self, telegram_id: int, username: str, added_by: int):
         if self.is_admin(telegram_id):
             raise ValueError("User is already an admin.")
@@ -97,23 +177,72 @@ class AdminService:
         # ✅ CORRECT METHOD
         self.sheets.append_row(self.SHEET_NAME, row)
 
+        # Write-through: the new admin is known without a re-read
+        with self._lock:
+            self._rows = self._rows + [row]
+            self._index = self._build_index(self._rows)
+
     # =====================================================
     # DISABLE ADMIN
     # =====================================================
+    @sheets_priority(PRIORITY_BACKGROUND)
     def disable_admin(self, telegram_id: int):
         if self.emergency_root_id and telegram_id == self.emergency_root_id:
             raise ValueError("Emergency root admin cannot be disabled.")
 
-        rows = self._read_all_rows()
-
-        for index, row in enumerate(rows):
+        for row in self._read_all_rows():
             if str(row.get("Telegram ID")) == str(telegram_id):
 
                 if self._get_type(row) == "root":
                     raise ValueError("Root admin cannot be disabled.")
 
-                rows[index]["Status"] = "inactive"
-                self.sheets.update(self.SHEET_NAME, rows)
+                # Only the Status cell(s) are written, the tab is never cleared
+                self.sheets.patch_rows_where(
+                    self.SHEET_NAME,
+                    "Telegram ID",
+                    telegram_id,
+                    {"Status": "inactive"},
+                )
+
+                # Write-through: access is revoked right away
+                with self._lock:
+                    self._rows = [
+                        dict(r, Status="inactive")
+                        if str(r.get("Telegram ID")).strip() == str(telegram_id).strip()
+                        else r
+                        for r in self._rows
+                    ]
+                    self._index = self._build_index(self._rows)
                 return
 
         raise ValueError("Admin not found.")
+
+    # =====================================================
+    # ASYNC (NON-BLOCKING) VARIANTS
+    # =====================================================
+    # Served inline while the index is fresh (no thread hop)
+    async def ais_root(self, telegram_id: int) -> bool:
+        if self._is_fresh():
+            return self.is_root(telegram_id)
+        return await self.sheets.run_async(self.is_root, telegram_id)
+
+    async def ais_admin(self, telegram_id: int) -> bool:
+        if self._is_fresh():
+            return self.is_admin(telegram_id)
+        return await self.sheets.run_async(self.is_admin, telegram_id)
+
+    async def aget_role(self, telegram_id: int) -> str:
+        if self._is_fresh():
+            return self.get_role(telegram_id)
+        return await self.sheets.run_async(self.get_role, telegram_id)
+
+    async def aget_active_admins(self) -> List[Dict]:
+        if self._is_fresh():
+            return self.get_active_admins()
+        return await self.sheets.run_async(self.get_active_admins)
+
+    async def aadd_admin(self, telegram_id: int, username: str, added_by: int):
+        await self.sheets.run_async(self.add_admin, telegram_id, username, added_by)
+
+    async def adisable_admin(self, telegram_id: int):
+        await self.sheets.run_async(self.disable_admin, telegram_id)
@@ -0,0 +1,65 @@
+import threading
+from typing import Dict
+
+from google.auth.transport.requests import AuthorizedSession
+from google.oauth2.service_account import Credentials
+from requests.adapters import HTTPAdapter
+
+SCOPES = [
+    "https://www.googleapis.com/auth/spreadsheets",
+    "https://www.googleapis.com/auth/drive",
+]
+
+# service account path → session, one per process
+_sessions: Dict[str, "SharedAuthorizedSession"] = {}
+_sessions_lock = threading.Lock()
+
+
+class SharedAuthorizedSession(AuthorizedSession):
+    """
+    Authorized HTTP session shared by every Google API caller.
+    - Keep-alive connection pool sized for the Sheets worker threads
+    - Token refresh is single-flight: one thread refreshes,
+      the others wait and reuse the new token
+    """
+
+    def __init__(self, credentials: Credentials, pool_size: int = 10):
+        super().__init__(credentials)
+
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.mount("https://", adapter)
+
+        self._refresh_lock = threading.Lock()
+
+    def ensure_token(self) -> None:
+        """
+        Refreshes the access token if needed, once for all threads.
+        """
+        if self.credentials.valid:
+            return
+
+        with self._refresh_lock:
+            # Another thread may have refreshed while we waited
+            if not self.credentials.valid:
+                self.credentials.refresh(self._auth_request)
+
+    def request(self, method, url, data=None, headers=None, **kwargs):
+        self.ensure_token()
+        return super().request(method, url, data=data, headers=headers, **kwargs)
+
+
+def get_session(service_account_path: str, pool_size: int = 10) -> SharedAuthorizedSession:
+    """
+    Returns the process-wide session for a service account.
+    The first caller decides the pool size.
+    """
+    with _sessions_lock:
+        session = _sessions.get(service_account_path)
+        if session is None:
+            credentials = Credentials.from_service_account_file(
+                service_account_path,
+                scopes=SCOPES,
+            )
+            session = _sessions[service_account_path] = SharedAuthorizedSession(credentials, pool_size)
+
+    return session
@@ -1,43 +1,351 @@
+import threading
+import time
+
 import gspread
-from google.oauth2.service_account import Credentials
-from typing import List, Dict, Any, Optional
+from gspread.exceptions import APIError, WorksheetNotFound
+from gspread.utils import absolute_range_name, rowcol_to_a1
+from typing import List, Dict, Any, Optional, Callable, Iterable, Iterator, Tuple
+
+from bot.services.google_auth import get_session
+from bot.services.sheet_revisions import RevisionSource
+from bot.services.sheets_metrics import SheetsMetrics
+from bot.services.sheets_scheduler import SheetsScheduler
+from bot.services.storage import (
+    AsyncStorageMixin,
+    fill_gaps,
+    project_columns,
+    to_records,
+)
 
 
-class GoogleSheetsService:
+class GoogleSheetsService(AsyncStorageMixin):
     """
     Central Google Sheets service.
     Handles auth, read, append, update.
-    Fresh spreadsheet access on every operation
-    to avoid stale data in long-running bots.
+    Spreadsheet / worksheet handles are cached per sheet name
+    (metadata only), cell data is fetched fresh on every
+    operation to avoid stale data in long-running bots.
     """
 
-    def __init__(self, sheet_id: str, service_account_path: str):
+    def __init__(
+        self,
+        sheet_id: str,
+        service_account_path: str,
+        handle_ttl: float = 300.0,
+        max_workers: int = 8,
+        pool_size: int = 10,
+        scheduler: Optional[SheetsScheduler] = None,
+        metrics: Optional[SheetsMetrics] = None,
+    ):
         self.sheet_id = sheet_id
         self.service_account_path = service_account_path
+        self.pool_size = pool_size
         self.client = self._authorize()
 
+        # Quota / priority / retry gate for every API call
+        self.scheduler = scheduler or SheetsScheduler()
+        # Per-call counts / latency, tagged by tab and Telegram handler
+        self.metrics = metrics or SheetsMetrics()
+
+        # Handle cache (0 = reopen on every call, old behaviour)
+        self.handle_ttl = handle_ttl
+        self._spreadsheet: Optional[gspread.Spreadsheet] = None
+        self._worksheets: Dict[str, Tuple[gspread.Worksheet, float]] = {}
+        self._lock = threading.RLock()
+
+        # Header row cache: sheet → headers / column index map
+        # (shares `handle_ttl`, refreshed early on column mismatch)
+        self._headers: Dict[str, Dict[str, Any]] = {}
+
+        # Bounded pool for the async (a*) API
+        self._init_executor(max_workers)
+
+        # Optional local read-replica (see SheetMirror)
+        self.mirror = None
+
+        # Optional change detection: sheet → (revision, values, fetched_at)
+        self.revisions: Optional[RevisionSource] = None
+        self.revision_max_age = 300.0
+        self._revision_cache: Dict[str, Tuple[str, List[List[Any]], float]] = {}
+
+    def attach_mirror(self, mirror) -> None:
+        """
+        Serve reads from a SheetMirror and keep it updated on writes.
+        """
+        self.mirror = mirror
+
+    def attach_revision_source(
+        self,
+        source: RevisionSource,
+        max_age: float = 300.0,
+    ) -> None:
+        """
+        Re-download a tab only when `source` reports a new revision.
+        `max_age` caps how long unchanged values are reused.
+        """
+        self.revisions = source
+        self.revision_max_age = max_age
+
+    def current_revision(self) -> Optional[str]:
+        return self.revisions.revision() if self.revisions else None
+
     # =====================================================
     # AUTH
     # =====================================================
     def _authorize(self) -> gspread.Client:
-        scopes = [
-            "https://www.googleapis.com/auth/spreadsheets",
-            "https://www.googleapis.com/auth/drive",
-        ]
+        # One authorized keep-alive session per process (see google_auth)
+        self.session = get_session(self.service_account_path, self.pool_size)
+        return gspread.Client(auth=self.session.credentials, session=self.session)
+
+    # =====================================================
+    # INTERNAL: EVERY API CALL GOES THROUGH HERE
+    # =====================================================
+    def _call(
+        self,
+        kind: str,
+        op: str,
+        sheet_name: Optional[str],
+        func: Callable[..., Any],
+        *args,
+        idempotent: bool = True,
+        **kwargs,
+    ) -> Any:
+        def _timed(*call_args, **call_kwargs) -> Any:
+            # Each attempt is one real API call (quota wait excluded)
+            started = time.perf_counter()
+            ok = False
+            try:
+                result = func(*call_args, **call_kwargs)
+                ok = True
+                return result
+            finally:
+                self.metrics.record(op, sheet_name, time.perf_counter() - started, ok)
+
+        return self.scheduler.call(
+            kind, op, _timed, *args, idempotent=idempotent, **kwargs
+        )
+
+    # =====================================================
+    # INTERNAL: CACHED SPREADSHEET / WORKSHEET HANDLES
+    # =====================================================
+    def _get_spreadsheet(self) -> gspread.Spreadsheet:
+        with self._lock:
+            spreadsheet = self._spreadsheet
 
-        credentials = Credentials.from_service_account_file(
-            self.service_account_path,
-            scopes=scopes,
+        if spreadsheet is not None and self.handle_ttl > 0:
+            return spreadsheet
+
+        # Opened outside the lock: the call may wait for quota
+        spreadsheet = self._call(
+            "read", "open", None, self.client.open_by_key, self.sheet_id
         )
 
-        return gspread.authorize(credentials)
+        with self._lock:
+            self._spreadsheet = spreadsheet
+        return spreadsheet
+
+    def _get_worksheet(self, sheet_name: str) -> gspread.Worksheet:
+        """
+        Returns a worksheet handle, reusing a cached one
+        while it is younger than `handle_ttl` seconds.
+        """
+        with self._lock:
+            cached = self._worksheets.get(sheet_name)
+
+        if cached and time.monotonic() - cached[1] < self.handle_ttl:
+            return cached[0]
+
+        try:
+            worksheet = self._call(
+                "read", "worksheet", sheet_name, self._get_spreadsheet().worksheet, sheet_name
+            )
+        except WorksheetNotFound:
+            # Tab renamed or deleted → drop everything we know about it
+            self.invalidate_handles(sheet_name)
+            raise
+
+        if self.handle_ttl > 0:
+            with self._lock:
+                self._worksheets[sheet_name] = (worksheet, time.monotonic())
+
+        return worksheet
+
+    def invalidate_handles(self, sheet_name: Optional[str] = None) -> None:
+        """
+        Drops cached handles for one tab (or all of them).
+        Call after renaming / recreating tabs.
+        """
+        with self._lock:
+            if sheet_name is None:
+                self._worksheets.clear()
+                self._spreadsheet = None
+            else:
+                self._worksheets.pop(sheet_name, None)
+
+        self.invalidate_headers(sheet_name)
+
+    # =====================================================
+    # INTERNAL: HEADER ROW CACHE
+    # =====================================================
+    def _cache_headers(self, sheet_name: str, headers: List[str]) -> Dict[str, Any]:
+        entry = {
+            "headers": list(headers),
+            # 1-based column index per header (first occurrence wins)
+            "index": {
+                name: col
+                for col, name in reversed(list(enumerate(headers, start=1)))
+            },
+            # Columns a re-read already confirmed are not in the sheet
+            "missing": set(),
+            "fetched_at": time.monotonic(),
+        }
+
+        if self.handle_ttl > 0:
+            with self._lock:
+                self._headers[sheet_name] = entry
+
+        return entry
+
+    def _get_headers(
+        self,
+        sheet_name: str,
+        worksheet: gspread.Worksheet,
+        columns: Iterable[str] = (),
+    ) -> Dict[str, Any]:
+        """
+        Returns the cached header entry for a tab.
+        Re-reads row 1 when the entry expired or when one of
+        `columns` is unknown (column added / renamed in the sheet).
+        """
+        columns = list(columns)
+
+        with self._lock:
+            entry = self._headers.get(sheet_name)
+
+        if entry and time.monotonic() - entry["fetched_at"] < self.handle_ttl:
+            unknown = [
+                c for c in columns
+                if c not in entry["index"] and c not in entry["missing"]
+            ]
+            if not unknown:
+                return entry
+
+        headers = self._call("read", "row_values", sheet_name, worksheet.row_values, 1)
+        entry = self._cache_headers(sheet_name, headers)
+        entry["missing"].update(c for c in columns if c not in entry["index"])
+        return entry
+
+    def invalidate_headers(self, sheet_name: Optional[str] = None) -> None:
+        """
+        Forgets cached header rows for one tab (or all of them).
+        """
+        with self._lock:
+            if sheet_name is None:
+                self._headers.clear()
+            else:
+                self._headers.pop(sheet_name, None)
+
+    @staticmethod
+    def _status_code(error: APIError) -> Optional[int]:
+        response = getattr(error, "response", None)
+        return getattr(response, "status_code", None)
+
+    def _with_worksheet(
+        self,
+        sheet_name: str,
+        action: Callable[[gspread.Worksheet], Any],
+    ) -> Any:
+        """
+        Runs `action` against the (cached) worksheet.
+        A cached handle that points to a renamed / recreated tab
+        fails with HTTP 400 → reopen the tab once and retry.
+        """
+        worksheet = self._get_worksheet(sheet_name)
+
+        try:
+            return action(worksheet)
+        except APIError as e:
+            if self._status_code(e) != 400 or self.handle_ttl <= 0:
+                raise
+
+            self.invalidate_handles(sheet_name)
+            return action(self._get_worksheet(sheet_name))
+
+    # =====================================================
+    # INTERNAL: REVISION CACHE
+    # =====================================================
+    def _unchanged_values(
+        self,
+        sheet_name: str,
+        revision: Optional[str],
+    ) -> Optional[List[List[Any]]]:
+        """
+        Values from the last fetch if the spreadsheet has not changed since.
+        """
+        if revision is None:
+            return None
+
+        with self._lock:
+            entry = self._revision_cache.get(sheet_name)
+
+        if (
+            not entry
+            or entry[0] != revision
+            or time.monotonic() - entry[2] > self.revision_max_age
+        ):
+            return None
+
+        return entry[1]
+
+    def _remember_values(
+        self,
+        sheet_name: str,
+        revision: Optional[str],
+        values: List[List[Any]],
+    ) -> None:
+        # `revision` is read BEFORE the fetch: an edit racing the
+        # download leaves an older marker → re-downloaded next time
+        if revision is None:
+            return
+
+        with self._lock:
+            self._revision_cache[sheet_name] = (revision, values, time.monotonic())
+
+    def _forget_values(self, sheet_name: str) -> None:
+        # Our own write: don't wait for Drive to report the new revision
+        with self._lock:
+            self._revision_cache.pop(sheet_name, None)
+
+    def _local_values(self, sheet_name: str) -> Optional[List[List[Any]]]:
+        """
+        Tab values we can serve without downloading the tab.
+        """
+        if self.mirror:
+            values = self.mirror.get(sheet_name)
+            if values is not None:
+                return values
+
+        return self._unchanged_values(sheet_name, self.current_revision())
 
     # =====================================================
-    # INTERNAL: ALWAYS GET FRESH WORKSHEET
+    # INTERNAL: BATCH FETCH
     # =====================================================
-    def _get_worksheet(self, sheet_name: str):
-        spreadsheet = self.client.open_by_key(self.sheet_id)
-        return spreadsheet.worksheet(sheet_name)
+    def batch_get_values(self, sheet_names: List[str]) -> Dict[str, List[List[Any]]]:
+        """
+        Fetches whole tabs with ONE values_batch_get request and
+        returns raw rows per tab. Always goes to Google: neither the
+        mirror nor the revision cache is consulted (the mirror uses
+        this to refresh itself).
+        """
+        ranges = [absolute_range_name(name) for name in sheet_names]
+        response = self._call(
+            "read", "values_batch_get", ",".join(sheet_names), self._get_spreadsheet().values_batch_get, ranges
+        )
+
+        return {
+            name: fill_gaps(value_range.get("values", []))
+            for name, value_range in zip(sheet_names, response.get("valueRanges", []))
+        }
 
     # =====================================================
     # READ (DICT BASED)
@@ -45,25 +353,287 @@ class GoogleSheetsService:
     def read_sheet(self, sheet_name: str) -> List[Dict[str, Any]]:
         """
         Reads a sheet and returns list of dicts using header row.
-        Always fresh.
+        Always fresh (or within the mirror's staleness bound).
         """
-        worksheet = self._get_worksheet(sheet_name)
-        return worksheet.get_all_records() or []
+        return to_records(self.get_values(sheet_name))
 
     # ✅ BACKWARD COMPATIBILITY
     def get_rows(self, sheet_name: str) -> List[Dict[str, Any]]:
         return self.read_sheet(sheet_name)
 
+    # =====================================================
+    # READ MANY TABS (ONE REQUEST)
+    # =====================================================
+    def read_many(self, sheet_names: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Reads several tabs with a single values_batch_get and
+        returns dict rows per tab. Tabs still fresh in the mirror
+        or unchanged since their last fetch are not fetched again,
+        fetched tabs warm the mirror.
+        """
+        values: Dict[str, List[List[Any]]] = {}
+
+        for sheet_name in dict.fromkeys(sheet_names):
+            cached = self.mirror.get(sheet_name) if self.mirror else None
+            if cached is not None:
+                values[sheet_name] = cached
+
+        missing = [name for name in dict.fromkeys(sheet_names) if name not in values]
+        if missing:
+            revision = self.current_revision()
+            unchanged = {
+                name: self._unchanged_values(name, revision) for name in missing
+            }
+            fetched = {name: cached for name, cached in unchanged.items() if cached is not None}
+
+            stale = [name for name in missing if name not in fetched]
+            if stale:
+                downloaded = self.batch_get_values(stale)
+                for sheet_name, tab_values in downloaded.items():
+                    self._remember_values(sheet_name, revision, tab_values)
+                fetched.update(downloaded)
+
+            values.update(fetched)
+
+            if self.mirror:
+                for sheet_name, tab_values in fetched.items():
+                    self.mirror.store(sheet_name, tab_values)
+
+        return {name: to_records(values.get(name, [])) for name in sheet_names}
+
     # =====================================================
     # READ (RAW VALUES)
     # =====================================================
     def get_values(self, sheet_name: str) -> List[List[Any]]:
         """
         Reads raw values (rows) from a sheet.
-        Always fresh.
+        Always fresh (or within the mirror's staleness bound).
+        With a revision source, unchanged tabs are not re-downloaded.
         """
-        worksheet = self._get_worksheet(sheet_name)
-        return worksheet.get_all_values() or []
+        if self.mirror:
+            values = self.mirror.get(sheet_name)
+            if values is not None:
+                return values
+
+        revision = self.current_revision()
+        values = self._unchanged_values(sheet_name, revision)
+
+        if values is None:
+            values = self._with_worksheet(
+                sheet_name,
+                lambda ws: self._call("read", "get_all_values", sheet_name, ws.get_all_values) or [],
+            )
+            self._remember_values(sheet_name, revision, values)
+
+        if self.mirror:
+            self.mirror.store(sheet_name, values)
+
+        return values
+
+    # =====================================================
+    # READ (COLUMN PROJECTION / ROW RANGE)
+    # =====================================================
+    def read_columns(
+        self,
+        sheet_name: str,
+        columns: List[str],
+        start_row: int = 2,
+        end_row: Optional[int] = None,
+    ) -> List[List[Any]]:
+        """
+        Reads only `columns` (by header name) of rows start_row..end_row
+        (1-based, inclusive, None = to the last row).
+        One list per row, one cell per requested column
+        ("" for unknown columns). Only those ranges are downloaded.
+        """
+        columns = list(columns)
+        local = self._local_values(sheet_name)
+        if local is not None:
+            return project_columns(local, columns, start_row, end_row)
+
+        return self._fetch_columns(sheet_name, columns, start_row, end_row)
+
+    def _fetch_columns(
+        self,
+        sheet_name: str,
+        columns: List[str],
+        start_row: int,
+        end_row: Optional[int],
+    ) -> List[List[Any]]:
+        def _read(worksheet: gspread.Worksheet) -> List[List[Any]]:
+            index = self._get_headers(sheet_name, worksheet, columns)["index"]
+            known = [column for column in dict.fromkeys(columns) if column in index]
+            if not known:
+                return []
+
+            ranges = []
+            for column in known:
+                letter = rowcol_to_a1(1, index[column])[:-1]
+                ranges.append(absolute_range_name(
+                    sheet_name, f"{letter}{start_row}:{letter}{end_row or ''}"
+                ))
+
+            response = self._call(
+                "read", "values_batch_get", sheet_name,
+                self._get_spreadsheet().values_batch_get, ranges,
+                params={"majorDimension": "COLUMNS"},
+            )
+
+            # Each range comes back as one column, trailing blanks trimmed
+            cells: Dict[str, List[Any]] = {}
+            for column, value_range in zip(known, response.get("valueRanges", [])):
+                found = value_range.get("values") or [[]]
+                cells[column] = found[0]
+
+            height = max((len(values) for values in cells.values()), default=0)
+            return [
+                [
+                    cells[column][i] if column in cells and i < len(cells[column]) else ""
+                    for column in columns
+                ]
+                for i in range(height)
+            ]
+
+        return self._with_worksheet(sheet_name, _read)
+
+    def _fetch_rows(self, sheet_name: str, start_row: int, end_row: int) -> List[List[Any]]:
+        """
+        Whole rows start_row..end_row, padded to the header width.
+        """
+        def _read(worksheet: gspread.Worksheet) -> List[List[Any]]:
+            width = len(self._get_headers(sheet_name, worksheet)["headers"])
+            response = self._call(
+                "read", "values_batch_get", sheet_name,
+                self._get_spreadsheet().values_batch_get,
+                [absolute_range_name(sheet_name, f"{start_row}:{end_row}")],
+            )
+
+            value_ranges = response.get("valueRanges") or [{}]
+            rows = value_ranges[0].get("values", [])
+            return [list(row) + [""] * (width - len(row)) for row in rows]
+
+        return self._with_worksheet(sheet_name, _read)
+
+    # =====================================================
+    # READ (STREAMING, BOUNDED MEMORY)
+    # =====================================================
+    def iter_rows(
+        self,
+        sheet_name: str,
+        chunk_size: int = 500,
+        columns: Optional[List[str]] = None,
+        start_row: int = 2,
+    ) -> Iterator[List[Any]]:
+        """
+        Yields rows lazily, one `chunk_size` row range per request,
+        so scans can stop early and never hold the whole tab.
+        With `columns`, rows hold only those columns (see read_columns).
+        Paging runs to the worksheet's row_count: Sheets trims trailing
+        blank cells, so a short chunk does not mean the data ended.
+        """
+        columns = list(columns) if columns else None
+
+        # Already in memory (mirror / unchanged revision): no paging needed
+        local = self._local_values(sheet_name)
+        if local is not None:
+            if columns:
+                yield from project_columns(local, columns, start_row)
+            else:
+                yield from local[start_row - 1:]
+            return
+
+        start = start_row
+        while True:
+            row_count = self._get_worksheet(sheet_name).row_count
+
+            if start > row_count:
+                # Cached handle may predate rows added since → reopen once
+                self.invalidate_handles(sheet_name)
+                row_count = self._get_worksheet(sheet_name).row_count
+                if start > row_count:
+                    return
+
+            end = min(start + chunk_size - 1, row_count)
+
+            if columns:
+                chunk = self._fetch_columns(sheet_name, columns, start, end)
+            else:
+                chunk = self._fetch_rows(sheet_name, start, end)
+
+            yield from chunk
+            start = end + 1
+
+    def get_column(
+        self,
+        sheet_name: str,
+        column_name: str,
+        start_row: int = 2,
+        end_row: Optional[int] = None,
+    ) -> List[Any]:
+        """
+        One column's values (header row excluded by default).
+        """
+        return [
+            row[0]
+            for row in self.read_columns(sheet_name, [column_name], start_row, end_row)
+        ]
+
+    # =====================================================
+    # TABS (LIST / HEADER / CREATE)
+    # =====================================================
+    def list_sheets(self) -> List[str]:
+        """
+        Titles of every tab in the spreadsheet.
+        """
+        worksheets = self._call(
+            "read", "worksheets", None, self._get_spreadsheet().worksheets
+        )
+        return [worksheet.title for worksheet in worksheets]
+
+    def get_header_row(self, sheet_name: str) -> List[str]:
+        """
+        Row 1 of a tab (cached, see _get_headers).
+        """
+        return self._with_worksheet(
+            sheet_name,
+            lambda ws: list(self._get_headers(sheet_name, ws)["headers"]),
+        )
+
+    def ensure_sheet(self, sheet_name: str, headers: List[str]) -> None:
+        """
+        Creates the tab with `headers` as row 1 unless it exists.
+        """
+        try:
+            self._get_worksheet(sheet_name)
+            return
+        except WorksheetNotFound:
+            pass
+
+        # A 1-column tab would reject the first multi-column write
+        if not headers:
+            raise RuntimeError(f"Cannot create tab {sheet_name!r} without a header row")
+
+        try:
+            worksheet = self._call(
+                "write", "add_worksheet", sheet_name,
+                self._get_spreadsheet().add_worksheet,
+                sheet_name, rows=1000, cols=len(headers),
+                idempotent=False,
+            )
+        except APIError as e:
+            # Created in the meantime (another worker / process)
+            if self._status_code(e) != 400:
+                raise
+            self.invalidate_handles(sheet_name)
+            self._get_worksheet(sheet_name)
+            return
+
+        self._call("write", "update", sheet_name, worksheet.update, "A1", [list(headers)])
+        self._cache_headers(sheet_name, headers)
+
+        if self.handle_ttl > 0:
+            with self._lock:
+                self._worksheets[sheet_name] = (worksheet, time.monotonic())
 
     # =====================================================
     # APPEND (DICT SAFE)
@@ -73,16 +643,50 @@ class GoogleSheetsService:
         Appends a row using column headers order.
         Always fresh.
         """
-        worksheet = self._get_worksheet(sheet_name)
-        headers = worksheet.row_values(1)
+        self.append_rows(sheet_name, [row])
 
-        # Auto-create header if empty
-        if not headers:
-            headers = list(row.keys())
-            worksheet.insert_row(headers, 1)
+    def append_rows(self, sheet_name: str, rows: List[Dict[str, Any]]) -> None:
+        """
+        Appends many rows with a single values_append call.
+        Rows are mapped using column headers order.
+        """
+        if not rows:
+            return
+
+        columns = {key for row in rows for key in row}
+
+        def _append(worksheet: gspread.Worksheet) -> None:
+            headers = self._get_headers(sheet_name, worksheet, columns)["headers"]
+            created = False
+
+            # Auto-create header if empty
+            if not headers:
+                headers = list(rows[0].keys())
+                self._call(
+                    "write", "insert_row", sheet_name, worksheet.insert_row, headers, 1,
+                    idempotent=False,
+                )
+                self._cache_headers(sheet_name, headers)
+                created = True
 
-        values = [row.get(header, "") for header in headers]
-        worksheet.append_row(values, value_input_option="USER_ENTERED")
+            values = [
+                [row.get(header, "") for header in headers]
+                for row in rows
+            ]
+            self._call(
+                "write", "append_rows", sheet_name, worksheet.append_rows, values,
+                value_input_option="USER_ENTERED",
+                idempotent=False,
+            )
+            self._forget_values(sheet_name)
+
+            if self.mirror:
+                if created:
+                    self.mirror.invalidate(sheet_name)
+                else:
+                    self.mirror.append(sheet_name, values)
+
+        self._with_worksheet(sheet_name, _append)
 
     # =====================================================
     # UPDATE SINGLE ROW
@@ -97,15 +701,105 @@ class GoogleSheetsService:
         Updates specific columns in a given row index (1-based).
         Always fresh.
         """
-        worksheet = self._get_worksheet(sheet_name)
-        headers = worksheet.row_values(1)
+        self.batch_update_rows(sheet_name, [(row_index, updates)])
+
+    # =====================================================
+    # BATCH UPDATE (MANY ROWS / CELLS, ONE REQUEST)
+    # =====================================================
+    def batch_update_rows(
+        self,
+        sheet_name: str,
+        patches: List[Tuple[int, Dict[str, Any]]],
+    ) -> None:
+        """
+        Applies (row_index, {column: value}) patches in one batch_update.
+        Row indexes are 1-based, unknown columns are skipped.
+        Adjacent cells of a row are sent as a single range.
+        """
+        patches = [(row_index, updates) for row_index, updates in patches if updates]
+        if not patches:
+            return
+
+        columns = {column for _, updates in patches for column in updates}
+
+        def _batch(worksheet: gspread.Worksheet) -> None:
+            index = self._get_headers(sheet_name, worksheet, columns)["index"]
+            data = []
+            written: List[Tuple[int, int, Any]] = []
 
-        for column_name, new_value in updates.items():
-            if column_name not in headers:
-                continue
+            for row_index, updates in patches:
+                cells = sorted(
+                    (index[column], value)
+                    for column, value in updates.items()
+                    if column in index
+                )
 
-            col_index = headers.index(column_name) + 1
-            worksheet.update_cell(row_index, col_index, new_value)
+                # Group consecutive columns into one range
+                run: List[Tuple[int, Any]] = []
+                for col, value in cells + [(None, None)]:
+                    if run and (col is None or col != run[-1][0] + 1):
+                        start = rowcol_to_a1(row_index, run[0][0])
+                        end = rowcol_to_a1(row_index, run[-1][0])
+                        data.append({
+                            "range": start if start == end else f"{start}:{end}",
+                            "values": [[v for _, v in run]],
+                        })
+                        run = []
+                    if col is not None:
+                        run.append((col, value))
+                        written.append((row_index, col, value))
+
+            if data:
+                self._call(
+                    "write", "batch_update", sheet_name, worksheet.batch_update, data,
+                    value_input_option="USER_ENTERED",
+                )
+                self._forget_values(sheet_name)
+
+                if self.mirror:
+                    self.mirror.patch(sheet_name, written)
+
+        self._with_worksheet(sheet_name, _batch)
+
+    # =====================================================
+    # PATCH ROWS BY KEY
+    # =====================================================
+    def patch_rows_where(
+        self,
+        sheet_name: str,
+        column_name: str,
+        value: Any,
+        updates: Dict[str, Any],
+    ) -> int:
+        """
+        Sets `updates` on every row where column == value.
+        Reads only the key column, writes only the changed cells.
+        Returns the number of rows patched.
+        """
+        def _match_rows(worksheet: gspread.Worksheet) -> List[int]:
+            index = self._get_headers(sheet_name, worksheet, [column_name])["index"]
+
+            if column_name not in index:
+                return []
+
+            target = str(value).strip()
+            column = self._call(
+                "read", "col_values", sheet_name, worksheet.col_values, index[column_name]
+            )
+
+            return [
+                row_index
+                for row_index, cell in enumerate(column, start=1)
+                if row_index > 1 and str(cell).strip() == target
+            ]
+
+        row_indexes = self._with_worksheet(sheet_name, _match_rows)
+
+        self.batch_update_rows(
+            sheet_name,
+            [(row_index, updates) for row_index in row_indexes],
+        )
+        return len(row_indexes)
 
     # =====================================================
     # UPDATE FULL SHEET
@@ -113,21 +807,32 @@ class GoogleSheetsService:
     def update(self, sheet_name: str, rows: List[Dict[str, Any]]) -> None:
         """
         Replaces entire sheet content using dict rows.
-        Always fresh.
+        Bulk replace only: the tab is briefly empty while it is
+        rewritten, use patch_rows_where / batch_update_rows for
+        status changes.
         """
         if not rows:
             return
 
-        worksheet = self._get_worksheet(sheet_name)
-
         headers = list(rows[0].keys())
         values = [headers]
 
         for row in rows:
             values.append([row.get(h, "") for h in headers])
 
-        worksheet.clear()
-        worksheet.update("A1", values)
+        def _replace(worksheet: gspread.Worksheet) -> None:
+            self._forget_values(sheet_name)
+            self._call("write", "clear", sheet_name, worksheet.clear)
+            self._call("write", "update", sheet_name, worksheet.update, "A1", values)
+            self._cache_headers(sheet_name, headers)
+
+            if self.mirror:
+                self.mirror.store(
+                    sheet_name,
+                    [["" if v is None else str(v) for v in row] for row in values],
+                )
+
+        self._with_worksheet(sheet_name, _replace)
 
     # =====================================================
     # FIND ROW BY VALUE
@@ -142,13 +847,17 @@ class GoogleSheetsService:
         Finds first row index where column == value.
         Always fresh.
         """
-        worksheet = self._get_worksheet(sheet_name)
-        headers = worksheet.row_values(1)
+        def _find(worksheet: gspread.Worksheet) -> Optional[int]:
+            index = self._get_headers(sheet_name, worksheet, [column_name])["index"]
 
-        if column_name not in headers:
-            return None
+            if column_name not in index:
+                return None
+
+            cell = self._call(
+                "read", "find", sheet_name, worksheet.find, str(value),
+                in_column=index[column_name],
+            )
 
-        col_index = headers.index(column_name) + 1
-        cell = worksheet.find(str(value), in_column=col_index)
+            return cell.row if cell else None
 
-        return cell.row if cell else None
+        return self._with_worksheet(sheet_name, _find)
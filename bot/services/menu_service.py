@@ -1,7 +1,10 @@
+import threading
+import time
 from collections import defaultdict
-from typing import List
+from typing import Dict, List, Optional
 
-from bot.services.google_sheets import GoogleSheetsService
+from bot.services.storage import StorageBackend
+from bot.services.sheets_scheduler import PRIORITY_USER, sheets_priority
 from config.settings import Settings
 
 
@@ -12,20 +15,49 @@ class MenuService:
     - Applies markup
     - Groups by category
     - Formats display text
+    - Rows are kept in memory for `cache_ttl` seconds (primed by
+      the startup warm-up, so the first tap needs no read)
     (Quantity is intentionally NOT shown)
     """
 
     SHEET_NAME = "InventoryList"
 
-    def __init__(self, sheets: GoogleSheetsService, settings: Settings):
+    def __init__(self, sheets: StorageBackend, settings: Settings, cache_ttl: float = 30.0):
         self.sheets = sheets
         self.settings = settings
 
+        # InventoryList rows (cache_ttl = 0 → read the sheet on every tap)
+        self.cache_ttl = cache_ttl
+        self._rows: List[Dict] = []
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.RLock()
+
+    def _read_items(self) -> List[Dict]:
+        with self._lock:
+            if (
+                self._loaded_at is not None
+                and time.monotonic() - self._loaded_at < self.cache_ttl
+            ):
+                return self._rows
+
+        rows = self.sheets.read_sheet(self.SHEET_NAME) or []
+        self.prime(rows)
+        return rows
+
+    def prime(self, rows: List[Dict]) -> None:
+        """
+        Loads already fetched InventoryList rows (e.g. from the startup warm-up).
+        """
+        with self._lock:
+            self._rows = list(rows or [])
+            self._loaded_at = time.monotonic()
+
+    @sheets_priority(PRIORITY_USER)
     def get_menu_text_blocks(self) -> List[str]:
         """
         Returns menu text split into safe Telegram-sized blocks.
         """
-        items = self.sheets.read_sheet(self.SHEET_NAME)
+        items = self._read_items()
 
         # HARD SAFETY
         if not items:
@@ -97,3 +129,9 @@ class MenuService:
             blocks.append(current_block)
 
         return blocks
+
+    async def aget_menu_text_blocks(self) -> List[str]:
+        """
+        Non-blocking variant for handlers.
+        """
+        return await self.sheets.run_async(self.get_menu_text_blocks)
@@ -0,0 +1,286 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+STATUS_PENDING = "pending"
+STATUS_DEAD = "dead"
+
+
+class NotificationOutbox:
+    """
+    Durable queue of admin notifications (SQLite).
+    - A message is committed before the handler replies to the user
+    - chat_id NULL means "every active admin": the delivery worker
+      expands it into one row per admin, so each recipient is
+      retried on its own
+    - Delivered rows are deleted; rows that keep failing are kept
+      with status "dead" (dead letters) for inspection
+    - Digest mode buffers events in a second table until they are
+      folded into one message (see flush_events)
+    - Chats that cannot be reached, and when they were last reported,
+      are remembered across restarts
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS outbox ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " chat_id INTEGER,"
+            " text TEXT NOT NULL,"
+            " parse_mode TEXT,"
+            " status TEXT NOT NULL DEFAULT 'pending',"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " next_attempt_at REAL NOT NULL,"
+            " last_error TEXT,"
+            " created_at REAL NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS outbox_due ON outbox (status, next_attempt_at)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS events ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " payload_json TEXT NOT NULL,"
+            " created_at REAL NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS unreachable ("
+            " chat_id INTEGER PRIMARY KEY,"
+            " error TEXT NOT NULL,"
+            " since REAL NOT NULL,"
+            " retry_at REAL NOT NULL)"
+        )
+        # Small worker state that must survive restarts (last report, ...)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS meta ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL)"
+        )
+        self._db.commit()
+
+    # =====================================================
+    # INTERNAL
+    # =====================================================
+    @staticmethod
+    def _as_message(row) -> Dict[str, Any]:
+        message_id, chat_id, text, parse_mode, attempts = row
+        return {
+            "id": message_id,
+            "chat_id": chat_id,
+            "text": text,
+            "parse_mode": parse_mode,
+            "attempts": attempts,
+        }
+
+    # =====================================================
+    # PUBLIC API
+    # =====================================================
+    def enqueue(
+        self,
+        text: str,
+        parse_mode: Optional[str] = None,
+        chat_id: Optional[int] = None,
+    ) -> int:
+        """
+        Durably queues a message (chat_id None → all active admins).
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._db.execute(
+                "INSERT INTO outbox (chat_id, text, parse_mode, next_attempt_at, created_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (chat_id, text, parse_mode, now, now),
+            )
+            self._db.commit()
+            return cursor.lastrowid
+
+    def expand(self, message_id: int, chat_ids: Iterable[int]) -> None:
+        """
+        Replaces an "all admins" message with one row per recipient,
+        in one transaction.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT text, parse_mode, created_at FROM outbox WHERE id = ?",
+                (message_id,),
+            ).fetchone()
+            if row is None:
+                return
+
+            text, parse_mode, created_at = row
+            with self._db:
+                self._db.executemany(
+                    "INSERT INTO outbox (chat_id, text, parse_mode, next_attempt_at, created_at)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    [(chat_id, text, parse_mode, now, created_at) for chat_id in chat_ids],
+                )
+                self._db.execute("DELETE FROM outbox WHERE id = ?", (message_id,))
+
+    def due(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Pending messages whose next attempt is due, oldest first.
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id, chat_id, text, parse_mode, attempts FROM outbox"
+                " WHERE status = ? AND next_attempt_at <= ?"
+                " ORDER BY next_attempt_at, id LIMIT ?",
+                (STATUS_PENDING, time.time(), limit),
+            ).fetchall()
+        return [self._as_message(row) for row in rows]
+
+    def next_due_at(self) -> Optional[float]:
+        """
+        Unix time of the earliest pending attempt, None when empty.
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT MIN(next_attempt_at) FROM outbox WHERE status = ?",
+                (STATUS_PENDING,),
+            ).fetchone()
+        return row[0]
+
+    def mark_sent(self, message_id: int) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM outbox WHERE id = ?", (message_id,))
+            self._db.commit()
+
+    def mark_retry(self, message_id: int, error: str, delay: float) -> None:
+        with self._lock:
+            self._db.execute(
+                "UPDATE outbox SET attempts = attempts + 1, next_attempt_at = ?,"
+                " last_error = ? WHERE id = ?",
+                (time.time() + delay, error, message_id),
+            )
+            self._db.commit()
+
+    def mark_dead(self, message_id: int, error: str) -> None:
+        with self._lock:
+            self._db.execute(
+                "UPDATE outbox SET status = ?, attempts = attempts + 1,"
+                " last_error = ? WHERE id = ?",
+                (STATUS_DEAD, error, message_id),
+            )
+            self._db.commit()
+
+    def counts(self) -> Dict[str, int]:
+        """
+        Number of rows per status (pending / dead).
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT status, COUNT(*) FROM outbox GROUP BY status"
+            ).fetchall()
+        return {STATUS_PENDING: 0, STATUS_DEAD: 0, **dict(rows)}
+
+    # =====================================================
+    # DIGEST EVENTS
+    # =====================================================
+    def buffer_event(self, event: Dict[str, Any]) -> None:
+        """
+        Durably buffers an event for the next digest.
+        """
+        now = time.time()
+        payload = json.dumps({**event, "created_at": now}, default=str)
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO events (payload_json, created_at) VALUES (?, ?)",
+                (payload, now),
+            )
+            self._db.commit()
+
+    def oldest_event_at(self) -> Optional[float]:
+        """
+        Unix time of the oldest buffered event, None when empty.
+        """
+        with self._lock:
+            row = self._db.execute("SELECT MIN(created_at) FROM events").fetchone()
+        return row[0]
+
+    def flush_events(
+        self,
+        render: Callable[[List[Dict[str, Any]]], str],
+        chat_ids: Iterable[Optional[int]] = (None,),
+        parse_mode: Optional[str] = None,
+    ) -> int:
+        """
+        Folds every buffered event into ONE message per target chat
+        (None → all active admins). The messages are queued and the
+        events removed in one transaction.
+        Returns the number of events folded.
+        """
+        now = time.time()
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id, payload_json FROM events ORDER BY id"
+            ).fetchall()
+            if not rows:
+                return 0
+
+            text = render([json.loads(payload) for _, payload in rows])
+            with self._db:
+                self._db.executemany(
+                    "INSERT INTO outbox (chat_id, text, parse_mode, next_attempt_at, created_at)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    [(chat_id, text, parse_mode, now, now) for chat_id in chat_ids],
+                )
+                self._db.execute("DELETE FROM events WHERE id <= ?", (rows[-1][0],))
+            return len(rows)
+
+    # =====================================================
+    # UNREACHABLE CHATS
+    # =====================================================
+    def load_unreachable(self) -> Dict[int, Dict[str, Any]]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT chat_id, error, since, retry_at FROM unreachable"
+            ).fetchall()
+        return {
+            chat_id: {"error": error, "since": since, "retry_at": retry_at}
+            for chat_id, error, since, retry_at in rows
+        }
+
+    def save_unreachable(self, chat_id: int, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO unreachable (chat_id, error, since, retry_at)"
+                " VALUES (?, ?, ?, ?)",
+                (chat_id, entry["error"], entry["since"], entry["retry_at"]),
+            )
+            self._db.commit()
+
+    def clear_unreachable(self, chat_id: int) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM unreachable WHERE chat_id = ?", (chat_id,))
+            self._db.commit()
+
+    # =====================================================
+    # WORKER STATE
+    # =====================================================
+    def get_meta(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                (key, value),
+            )
+            self._db.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
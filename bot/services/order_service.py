@@ -1,7 +1,12 @@
-from typing import Dict
+import itertools
+import threading
+from typing import Dict, Iterator, List, Optional
 from datetime import datetime
 
-from bot.services.google_sheets import GoogleSheetsService
+from bot.services.shards import ShardIndex
+from bot.services.storage import StorageBackend
+from bot.services.sheets_scheduler import PRIORITY_USER, sheets_priority
+from bot.services.write_queue import WriteBehindQueue
 from bot.utils.helpers import utc_now_iso
 
 
@@ -11,38 +16,125 @@ class OrderService:
     ETH_SHEET = "ETH_Payments"
     USDT_SHEET = "USDT_Payments"
 
-    def __init__(self, sheets: GoogleSheetsService):
+    ORDER_ID_COLUMN = "Order ID"
+
+    def __init__(
+        self,
+        sheets: StorageBackend,
+        write_queue: Optional[WriteBehindQueue] = None,
+        scan_chunk_size: int = 5000,
+        shards: Optional[ShardIndex] = None,
+    ):
         """
         Central order & payment service.
         Uses a shared GoogleSheetsService instance.
+        With a write_queue, appends are acknowledged at once
+        and written to Sheets in batches (write-behind).
+        Order ID scans page through the ledger `scan_chunk_size` rows
+        at a time, so memory stays bounded as history grows.
+        With `shards`, rows go to monthly tabs (Orders_2026_10, ...):
+        orders by their Order ID's month, so lookups only read that
+        month, payments by the month they are made.
+        place_order() hands out Order IDs one at a time, so concurrent
+        updates never share an ID.
         """
         self.sheets = sheets
+        self.write_queue = write_queue
+        self.scan_chunk_size = scan_chunk_size
+        self.shards = shards
+
+        # Held from reading the last Order ID until the new row is appended
+        self._order_id_lock = threading.Lock()
+        # Last ID handed out by this process, in case a read lags behind
+        self._last_order_id = ""
+
+    # =====================================================
+    # INTERNAL
+    # =====================================================
+    def _append(self, sheet_name: str, data: Dict, when: Optional[datetime] = None) -> None:
+        """
+        Appends to `sheet_name`, or to its shard for `when` (default: now).
+        """
+        if not self.shards:
+            self._write(sheet_name, data)
+            return
+
+        shard = self.shards.ensure(sheet_name, when)
+        try:
+            self._write(shard, data)
+        except Exception:
+            # Shard renamed / deleted since the tab list was read
+            if not self.shards.recover(sheet_name, when):
+                raise
+            self._write(shard, data)
+
+    def _write(self, sheet_name: str, data: Dict) -> None:
+        if self.write_queue:
+            self.write_queue.enqueue(sheet_name, data)
+        else:
+            self.sheets.append_row(sheet_name, data)
+
+    def _order_tabs(self, order_id: Optional[str] = None) -> List[str]:
+        """
+        Orders tabs to search: the Order ID's month (default: today).
+        """
+        if not self.shards:
+            return [self.ORDERS_SHEET]
+
+        if order_id is None:
+            return self.shards.read_tabs(self.ORDERS_SHEET, datetime.utcnow())
+        return self.shards.tabs_for_order_id(self.ORDERS_SHEET, order_id)
+
+    def _pending_order_ids(self, tabs: List[str]) -> List[str]:
+        """
+        Order IDs accepted but not yet flushed to the sheet.
+        """
+        if not self.write_queue:
+            return []
+
+        return [
+            str(row.get(self.ORDER_ID_COLUMN, "")).strip()
+            for tab in tabs
+            for row in self.write_queue.pending_rows(tab)
+        ]
+
+    def _iter_order_ids(self, tabs: List[str]) -> Iterator[str]:
+        for tab in tabs:
+            for (order_id,) in self.sheets.iter_rows(
+                tab,
+                chunk_size=self.scan_chunk_size,
+                columns=[self.ORDER_ID_COLUMN],
+            ):
+                yield str(order_id).strip()
 
     # =====================================================
     # ORDERS
     # =====================================================
+    @sheets_priority(PRIORITY_USER)
     def create_order(self, data: Dict) -> None:
         data["Status"] = "Pending"
         data["Timestamp"] = utc_now_iso()
-        self.sheets.append_row(self.ORDERS_SHEET, data)
+        # Orders go to the Order ID's month, so lookups find them there
+        when = ShardIndex.order_month(data.get(self.ORDER_ID_COLUMN, ""))
+        self._append(self.ORDERS_SHEET, data, when)
 
+    @sheets_priority(PRIORITY_USER)
     def order_exists(self, order_id: str) -> bool:
         """
-        Robust Order ID validation using raw values.
+        Robust Order ID validation.
+        Only the Order ID column is downloaded, not the whole ledger,
+        and the scan stops at the first match.
         """
         try:
-            rows = self.sheets.get_values(self.ORDERS_SHEET)
-            if not rows or len(rows) < 2:
-                return False
-
             order_id = order_id.strip().upper()
+            tabs = self._order_tabs(order_id)
 
-            for row in rows[1:]:  # skip header
-                if not row:
-                    continue
+            # Not flushed yet, but already confirmed to the user
+            if order_id in (pending.upper() for pending in self._pending_order_ids(tabs)):
+                return True
 
-                sheet_order_id = str(row[0]).strip().upper()
-                if sheet_order_id == order_id:
+            for sheet_order_id in self._iter_order_ids(tabs):
+                if sheet_order_id.upper() == order_id:
                     return True
 
             return False
@@ -51,6 +143,7 @@ class OrderService:
             print(f"[OrderService] order_exists ERROR: {e}")
             return False
 
+    @sheets_priority(PRIORITY_USER)
     def generate_next_order_id(self) -> str:
         """
         Generates a unique Order ID.
@@ -61,14 +154,14 @@ class OrderService:
         prefix = f"ORD-{today}-"
 
         try:
-            rows = self.sheets.get_values(self.ORDERS_SHEET)
-            max_counter = 0
+            tabs = self._order_tabs()
+
+            # Pending first: a flush in between then shows up in the sheet read
+            pending = self._pending_order_ids(tabs)
 
-            for row in rows[1:]:
-                if not row:
-                    continue
+            max_counter = 0
 
-                order_id = str(row[0]).strip()
+            for order_id in itertools.chain(pending, self._iter_order_ids(tabs)):
                 if order_id.startswith(prefix):
                     try:
                         counter = int(order_id.split("-")[-1])
@@ -76,6 +169,9 @@ class OrderService:
                     except ValueError:
                         continue
 
+            if self._last_order_id.startswith(prefix):
+                max_counter = max(max_counter, int(self._last_order_id.split("-")[-1]))
+
             next_counter = max_counter + 1
             return f"{prefix}{next_counter:04d}"
 
@@ -83,26 +179,65 @@ class OrderService:
             print(f"[OrderService] generate_next_order_id ERROR: {e}")
             return f"{prefix}0001"
 
+    @sheets_priority(PRIORITY_USER)
+    def place_order(self, data: Dict) -> str:
+        """
+        Assigns the next Order ID and appends the order atomically.
+        Returns the Order ID.
+        """
+        with self._order_id_lock:
+            order_id = self.generate_next_order_id()
+            self.create_order({**data, self.ORDER_ID_COLUMN: order_id})
+            self._last_order_id = order_id
+        return order_id
+
     # =====================================================
     # BTC PAYMENTS
     # =====================================================
+    @sheets_priority(PRIORITY_USER)
     def create_btc_payment(self, data: Dict) -> None:
         data["Status"] = "Pending"
         data["Timestamp"] = utc_now_iso()
-        self.sheets.append_row(self.BTC_SHEET, data)
+        self._append(self.BTC_SHEET, data)
 
     # =====================================================
     # ETH PAYMENTS
     # =====================================================
+    @sheets_priority(PRIORITY_USER)
     def create_eth_payment(self, data: Dict) -> None:
         data["Status"] = "Pending"
         data["Timestamp"] = utc_now_iso()
-        self.sheets.append_row(self.ETH_SHEET, data)
+        self._append(self.ETH_SHEET, data)
 
     # =====================================================
     # USDT PAYMENTS
     # =====================================================
+    @sheets_priority(PRIORITY_USER)
     def create_usdt_payment(self, data: Dict) -> None:
         data["Status"] = "Pending"
         data["Timestamp"] = utc_now_iso()
-        self.sheets.append_row(self.USDT_SHEET, data)
+        self._append(self.USDT_SHEET, data)
+
+    # =====================================================
+    # ASYNC (NON-BLOCKING) VARIANTS
+    # =====================================================
+    async def acreate_order(self, data: Dict) -> None:
+        await self.sheets.run_async(self.create_order, data)
+
+    async def aorder_exists(self, order_id: str) -> bool:
+        return await self.sheets.run_async(self.order_exists, order_id)
+
+    async def agenerate_next_order_id(self) -> str:
+        return await self.sheets.run_async(self.generate_next_order_id)
+
+    async def aplace_order(self, data: Dict) -> str:
+        return await self.sheets.run_async(self.place_order, data)
+
+    async def acreate_btc_payment(self, data: Dict) -> None:
+        await self.sheets.run_async(self.create_btc_payment, data)
+
+    async def acreate_eth_payment(self, data: Dict) -> None:
+        await self.sheets.run_async(self.create_eth_payment, data)
+
+    async def acreate_usdt_payment(self, data: Dict) -> None:
+        await self.sheets.run_async(self.create_usdt_payment, data)
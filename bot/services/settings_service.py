@@ -1,14 +1,19 @@
-from bot.services.google_sheets import GoogleSheetsService
+from bot.services.storage import StorageBackend
+from bot.services.sheets_scheduler import PRIORITY_USER, sheets_priority
 
 class SettingsService:
     SHEET_NAME = "Settings"
 
-    def __init__(self, sheets: GoogleSheetsService):
+    def __init__(self, sheets: StorageBackend):
         self.sheets = sheets
 
+    @sheets_priority(PRIORITY_USER)
     def get(self, key: str, default=None):
         rows = self.sheets.read_sheet(self.SHEET_NAME)
         for row in rows:
             if row.get("key") == key:
                 return row.get("value")
         return default
+
+    async def aget(self, key: str, default=None):
+        return await self.sheets.run_async(self.get, key, default)
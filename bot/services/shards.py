@@ -0,0 +1,149 @@
+import re
+import threading
+import time
+from datetime import datetime
+from typing import List, Optional, Set
+
+from bot.services.storage import StorageBackend
+
+
+class ShardIndex:
+    """
+    Monthly shards of append-only tabs: Orders → Orders_2026_10.
+    - A shard is created on its first write, using the base tab's
+      header row as template (the base tab must exist)
+    - Writes go to the month given by the caller (default: now)
+    - Order lookups are routed by the date in ORD-YYYYMMDD-XXXX
+    - The base tab keeps pre-sharding history and is only read for
+      months that may still have rows in it (up to the first shard)
+    - The tab list is re-read every `ttl` seconds, and at once when a
+      write finds its shard gone (see recover)
+    """
+
+    ORDER_ID_DATE = re.compile(r"^ORD-(\d{4})(\d{2})\d{2}-")
+
+    def __init__(self, sheets: StorageBackend, ttl: float = 300.0):
+        self.sheets = sheets
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._known: Optional[Set[str]] = None   # existing tab names
+        self._loaded_at = 0.0
+
+    # =====================================================
+    # INTERNAL
+    # =====================================================
+    @staticmethod
+    def shard_name(base: str, when: datetime) -> str:
+        return f"{base}_{when:%Y_%m}"
+
+    @classmethod
+    def order_month(cls, order_id: str) -> Optional[datetime]:
+        """
+        First day of the month encoded in an Order ID, if any.
+        """
+        match = cls.ORDER_ID_DATE.match(str(order_id).strip().upper())
+        if not match:
+            return None
+        try:
+            return datetime(int(match.group(1)), int(match.group(2)), 1)
+        except ValueError:
+            return None
+
+    def _tabs(self) -> Set[str]:
+        # Shards we create are added as we go, the rest is re-read after `ttl`
+        with self._lock:
+            if self._known is not None and time.monotonic() - self._loaded_at < self.ttl:
+                return self._known
+
+        names = set(self.sheets.list_sheets())
+
+        with self._lock:
+            self._known = names
+            self._loaded_at = time.monotonic()
+            return self._known
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._known = None
+
+    def _shards(self, base: str) -> List[str]:
+        """
+        Existing shards of `base`, newest first.
+        """
+        pattern = re.compile(rf"^{re.escape(base)}_\d{{4}}_\d{{2}}$")
+        known = self._tabs()
+        with self._lock:
+            names = [name for name in known if pattern.match(name)]
+        return sorted(names, reverse=True)
+
+    # =====================================================
+    # WRITE ROUTING
+    # =====================================================
+    def ensure(self, base: str, when: Optional[datetime] = None) -> str:
+        """
+        Returns the shard for `when` (default: now), creating it if needed.
+        """
+        name = self.shard_name(base, when or datetime.utcnow())
+        known = self._tabs()
+
+        with self._lock:
+            if name in known:
+                return name
+
+        headers = self.sheets.get_header_row(base) if base in known else []
+        if not headers:
+            raise RuntimeError(
+                f"Cannot create shard {name!r}: base tab {base!r} is missing "
+                "or has no header row"
+            )
+        self.sheets.ensure_sheet(name, headers)
+
+        with self._lock:
+            known.add(name)
+        return name
+
+    def recover(self, base: str, when: Optional[datetime] = None) -> bool:
+        """
+        Called after a failed write: re-reads the tab list and
+        re-creates the shard if it was renamed or deleted.
+        Returns True when it was missing (the write can be retried).
+        """
+        name = self.shard_name(base, when or datetime.utcnow())
+        self.invalidate()
+
+        if name in self._tabs():
+            return False
+
+        self.ensure(base, when)
+        return True
+
+    # =====================================================
+    # READ ROUTING
+    # =====================================================
+    def read_tabs(self, base: str, when: datetime) -> List[str]:
+        """
+        Existing tabs that may hold rows dated `when`.
+        """
+        name = self.shard_name(base, when)
+        known = self._tabs()
+        shards = self._shards(base)
+
+        tabs = [name] if name in shards else []
+
+        # Months up to the first shard may still live in the base tab
+        if base in known and (not shards or name <= shards[-1]):
+            tabs.append(base)
+
+        return tabs
+
+    def tabs_for_order_id(self, base: str, order_id: str) -> List[str]:
+        """
+        Tabs to search for an Order ID: its month's shard (+ base tab
+        when needed), or every tab when the ID carries no date.
+        """
+        when = self.order_month(order_id)
+        if when:
+            return self.read_tabs(base, when)
+
+        has_base = base in self._tabs()
+        return self._shards(base) + ([base] if has_base else [])
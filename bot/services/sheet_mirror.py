@@ -0,0 +1,282 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from bot.services.sheets_scheduler import PRIORITY_BACKGROUND, sheets_priority
+
+logger = logging.getLogger(__name__)
+
+
+class SheetMirror:
+    """
+    Local read-replica of spreadsheet tabs.
+    - Keeps raw values (header row included) per tab in memory,
+      persisted to SQLite so restarts start warm
+    - A background thread re-fetches every tracked tab with ONE
+      values_batch_get and only rewrites tabs whose content changed
+    - Reads are served locally while younger than `max_staleness`
+    - Writes made through GoogleSheetsService are applied locally
+    """
+
+    def __init__(
+        self,
+        sheets,
+        db_path: str,
+        max_staleness: float = 30.0,
+        refresh_interval: float = 15.0,
+        tabs: Iterable[str] = (),
+    ):
+        self.sheets = sheets
+        self.db_path = db_path
+        self.max_staleness = max_staleness
+        self.refresh_interval = refresh_interval
+
+        # sheet → (values, digest, synced_at [unix time])
+        self._tabs: Dict[str, Tuple[List[List[Any]], str, float]] = {}
+        self._tracked: Set[str] = set(tabs)
+        self._dirty: Set[str] = set()     # content changed → rewrite row
+        self._touched: Set[str] = set()   # only synced_at changed
+        self._revision: Optional[str] = None  # spreadsheet revision at last refresh
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS tabs ("
+            " name TEXT PRIMARY KEY,"
+            " values_json TEXT NOT NULL,"
+            " digest TEXT NOT NULL,"
+            " synced_at REAL NOT NULL)"
+        )
+        self._db.commit()
+        self._load()
+
+        self._thread = threading.Thread(
+            target=self._run,
+            name="sheets-mirror",
+            daemon=True,
+        )
+        self._thread.start()
+
+    # =====================================================
+    # INTERNAL
+    # =====================================================
+    @staticmethod
+    def _digest(values: List[List[Any]]) -> str:
+        payload = json.dumps(values, separators=(",", ":"), default=str)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _as_cells(row: Iterable[Any]) -> List[str]:
+        # Sheets returns formatted strings, keep the mirror the same
+        return ["" if value is None else str(value) for value in row]
+
+    def _load(self) -> None:
+        with self._lock:
+            for name, values_json, digest, synced_at in self._db.execute(
+                "SELECT name, values_json, digest, synced_at FROM tabs"
+            ):
+                self._tabs[name] = (json.loads(values_json), digest, synced_at)
+                self._tracked.add(name)
+
+    def _persist(self) -> None:
+        with self._lock:
+            dirty = [(name, self._tabs.get(name)) for name in self._dirty]
+            touched = [
+                (self._tabs[name][2], name)
+                for name in self._touched - self._dirty
+                if name in self._tabs
+            ]
+            self._dirty.clear()
+            self._touched.clear()
+
+            self._db.executemany(
+                "UPDATE tabs SET synced_at = ? WHERE name = ?", touched
+            )
+
+            for name, entry in dirty:
+                if entry is None:
+                    self._db.execute("DELETE FROM tabs WHERE name = ?", (name,))
+                    continue
+
+                values, digest, synced_at = entry
+                self._db.execute(
+                    "INSERT OR REPLACE INTO tabs (name, values_json, digest, synced_at)"
+                    " VALUES (?, ?, ?, ?)",
+                    (name, json.dumps(values, default=str), digest, synced_at),
+                )
+
+            self._db.commit()
+
+    # =====================================================
+    # READ
+    # =====================================================
+    def get(self, sheet_name: str) -> Optional[List[List[Any]]]:
+        """
+        Returns the mirrored values, or None when missing / too stale.
+        """
+        with self._lock:
+            self._tracked.add(sheet_name)
+            entry = self._tabs.get(sheet_name)
+
+        if not entry or time.time() - entry[2] > self.max_staleness:
+            return None
+
+        return entry[0]
+
+    def peek(self, sheet_name: str) -> Optional[List[List[Any]]]:
+        """
+        Returns the mirrored values whatever their age (warm restarts).
+        """
+        with self._lock:
+            entry = self._tabs.get(sheet_name)
+
+        return entry[0] if entry else None
+
+    # =====================================================
+    # WRITE
+    # =====================================================
+    def store(self, sheet_name: str, values: List[List[Any]]) -> None:
+        """
+        Replaces a tab with freshly fetched values.
+        Unchanged tabs only get their sync time bumped.
+        """
+        digest = self._digest(values)
+
+        with self._lock:
+            self._tracked.add(sheet_name)
+            current = self._tabs.get(sheet_name)
+
+            if current and current[1] == digest:
+                self._tabs[sheet_name] = (current[0], digest, time.time())
+                self._touched.add(sheet_name)
+            else:
+                self._tabs[sheet_name] = (values, digest, time.time())
+                self._dirty.add(sheet_name)
+
+    def append(self, sheet_name: str, rows: List[List[Any]]) -> None:
+        """
+        Mirrors rows appended to the end of a tab.
+        """
+        with self._lock:
+            entry = self._tabs.get(sheet_name)
+            if not entry:
+                return
+
+            # In place: readers holding the list just see the new rows.
+            # Digest is cleared so the next refresh always takes
+            # Google's formatting of the new values.
+            entry[0].extend(self._as_cells(row) for row in rows)
+            self._tabs[sheet_name] = (entry[0], "", entry[2])
+            self._dirty.add(sheet_name)
+
+    def patch(self, sheet_name: str, cells: List[Tuple[int, int, Any]]) -> None:
+        """
+        Mirrors single-cell writes, (row, col) are 1-based.
+        """
+        with self._lock:
+            entry = self._tabs.get(sheet_name)
+            if not entry:
+                return
+
+            values = [list(row) for row in entry[0]]
+
+            for row_index, col_index, value in cells:
+                while len(values) < row_index:
+                    values.append([])
+                row = values[row_index - 1]
+                while len(row) < col_index:
+                    row.append("")
+                row[col_index - 1] = "" if value is None else str(value)
+
+            self._tabs[sheet_name] = (values, "", entry[2])
+            self._dirty.add(sheet_name)
+
+    def invalidate(self, sheet_name: Optional[str] = None) -> None:
+        """
+        Forgets one tab (or all of them) until the next fetch.
+        """
+        with self._lock:
+            names = [sheet_name] if sheet_name else list(self._tabs)
+            for name in names:
+                self._tabs.pop(name, None)
+                self._dirty.add(name)
+
+    # =====================================================
+    # BACKGROUND SYNC
+    # =====================================================
+    def _touch_all(self, tabs: List[str]) -> bool:
+        """
+        Marks every tab as just synced. False if one is not mirrored.
+        """
+        with self._lock:
+            if any(name not in self._tabs for name in tabs):
+                return False
+
+            now = time.time()
+            for name in tabs:
+                values, digest, _ = self._tabs[name]
+                self._tabs[name] = (values, digest, now)
+                self._touched.add(name)
+            return True
+
+    def refresh(self) -> None:
+        """
+        Re-fetches every tracked tab in one batch request.
+        Skipped when the spreadsheet revision has not changed.
+        """
+        with self._lock:
+            tabs = sorted(self._tracked)
+
+        revision = self.sheets.current_revision()
+        if (
+            tabs
+            and revision is not None
+            and revision == self._revision
+            and self._touch_all(tabs)
+        ):
+            tabs = []
+
+        if tabs:
+            # Mirrored local writes change the revision too → next refresh
+            # still picks up Google's formatting of the written values
+            self._revision = revision
+            try:
+                fetched = self.sheets.batch_get_values(tabs)
+            except Exception as e:
+                # One renamed / deleted tab fails the whole batch →
+                # fetch tab by tab and stop tracking the broken ones
+                logger.warning("Batch refresh failed (%s), refreshing tab by tab", e)
+                fetched = {}
+                for sheet_name in tabs:
+                    try:
+                        fetched.update(self.sheets.batch_get_values([sheet_name]))
+                    except Exception:
+                        with self._lock:
+                            self._tracked.discard(sheet_name)
+                        self.invalidate(sheet_name)
+
+            for sheet_name, values in fetched.items():
+                self.store(sheet_name, values)
+
+        self._persist()
+
+    @sheets_priority(PRIORITY_BACKGROUND)
+    def _run(self) -> None:
+        while not self._stop.wait(self.refresh_interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error("Sheet mirror refresh failed: %s", e)
+
+    def close(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        self._persist()
+
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,114 @@
+import logging
+import threading
+import time
+from typing import Optional, Protocol
+
+from bot.services.sheets_metrics import SheetsMetrics
+
+logger = logging.getLogger(__name__)
+
+
+class RevisionSource(Protocol):
+    """
+    Cheap "has the spreadsheet changed?" check.
+    revision() returns an opaque marker that changes whenever the
+    spreadsheet does, or None when unknown (→ always re-download).
+    """
+
+    def revision(self) -> Optional[str]: ...
+
+
+class DriveRevisionSource:
+    """
+    Reads the spreadsheet's Drive `version` (bumped on every edit,
+    by anyone) through the shared authorized session.
+    - Results are reused for `min_interval` seconds so a burst of
+      reads costs one metadata request
+    - After a failure (e.g. Drive API not enabled) the next check waits
+      `failure_backoff` seconds, and only the first failure is logged
+    - Drive has its own quota, so calls skip the Sheets scheduler
+    """
+
+    URL = "https://www.googleapis.com/drive/v3/files/{file_id}"
+
+    def __init__(
+        self,
+        session,
+        file_id: str,
+        min_interval: float = 2.0,
+        metrics: Optional[SheetsMetrics] = None,
+        failure_backoff: float = 60.0,
+    ):
+        self.session = session
+        self.file_id = file_id
+        self.min_interval = min_interval
+        self.metrics = metrics
+        self.failure_backoff = failure_backoff
+
+        self._lock = threading.Lock()
+        self._revision: Optional[str] = None
+        self._checked_at = 0.0
+        self._failing = False
+
+    def revision(self) -> Optional[str]:
+        with self._lock:
+            interval = self.failure_backoff if self._failing else self.min_interval
+            if time.monotonic() - self._checked_at < interval:
+                return self._revision
+
+            started = time.perf_counter()
+            ok = False
+            try:
+                response = self.session.get(
+                    self.URL.format(file_id=self.file_id),
+                    params={"fields": "version,modifiedTime", "supportsAllDrives": "true"},
+                    timeout=10,
+                )
+                response.raise_for_status()
+                meta = response.json()
+                ok = True
+            except Exception as e:
+                if not self._failing:
+                    logger.warning(
+                        "Drive revision check failed, retrying every %ss: %s",
+                        self.failure_backoff, e,
+                    )
+                else:
+                    logger.debug("Drive revision check failed: %s", e)
+                # Unknown until the next check, callers re-download
+                self._failing = True
+                self._revision = None
+                self._checked_at = time.monotonic()
+                return None
+            finally:
+                if self.metrics:
+                    self.metrics.record(
+                        "drive_revision", None, time.perf_counter() - started, ok
+                    )
+
+            if self._failing:
+                logger.info("Drive revision check recovered")
+                self._failing = False
+
+            self._revision = str(meta.get("version") or meta.get("modifiedTime") or "") or None
+            self._checked_at = time.monotonic()
+            return self._revision
+
+
+class ManualRevisionSource:
+    """
+    Local stand-in for Drive metadata (tests / local backends):
+    the marker only changes when bump() is called.
+    """
+
+    def __init__(self, revision: int = 1):
+        self._revision = revision
+        self._lock = threading.Lock()
+
+    def bump(self) -> None:
+        with self._lock:
+            self._revision += 1
+
+    def revision(self) -> Optional[str]:
+        with self._lock:
+            return str(self._revision)
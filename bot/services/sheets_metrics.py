@@ -0,0 +1,123 @@
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Telegram handler currently running (follows calls into the thread pool)
+_current_handler: ContextVar[str] = ContextVar("sheets_handler", default="background")
+
+
+@contextmanager
+def handler_tag(name: str) -> Iterator[None]:
+    """
+    Attributes every Sheets call made inside the block to `name`.
+    """
+    token = _current_handler.set(name)
+    try:
+        yield
+    finally:
+        _current_handler.reset(token)
+
+
+def current_handler() -> str:
+    return _current_handler.get()
+
+
+class SheetsMetrics:
+    """
+    Call counts and latency histograms for every underlying API call,
+    keyed by (handler, tab, op). Thread-safe, in-memory only.
+    """
+
+    # Histogram bucket upper bounds in milliseconds
+    BUCKETS_MS = (25, 50, 100, 250, 500, 1000, 2500, 5000, float("inf"))
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+
+    def record(self, op: str, sheet_name: Optional[str], seconds: float, ok: bool) -> None:
+        key = (current_handler(), sheet_name or "-", op)
+        elapsed_ms = seconds * 1000
+
+        with self._lock:
+            stat = self._stats.get(key)
+            if stat is None:
+                stat = self._stats[key] = {
+                    "calls": 0,
+                    "errors": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "buckets": [0] * len(self.BUCKETS_MS),
+                }
+
+            stat["calls"] += 1
+            stat["errors"] += 0 if ok else 1
+            stat["total_ms"] += elapsed_ms
+            stat["max_ms"] = max(stat["max_ms"], elapsed_ms)
+
+            for i, bound in enumerate(self.BUCKETS_MS):
+                if elapsed_ms <= bound:
+                    stat["buckets"][i] += 1
+                    break
+
+    def _percentile(self, buckets: List[int], calls: int, pct: float) -> float:
+        # Upper bound of the bucket holding the percentile (approximate)
+        target = calls * pct
+        seen = 0
+        for bound, count in zip(self.BUCKETS_MS, buckets):
+            seen += count
+            if seen >= target:
+                return bound
+        return self.BUCKETS_MS[-1]
+
+    def snapshot(
+        self,
+        handler: Optional[str] = None,
+        sheet_name: Optional[str] = None,
+        op: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Returns one dict per (handler, tab, op), busiest first.
+        Filters narrow the result to one handler / tab / op.
+        """
+        with self._lock:
+            items = [(key, dict(stat, buckets=list(stat["buckets"]))) for key, stat in self._stats.items()]
+
+        rows = []
+        for (row_handler, row_sheet, row_op), stat in items:
+            if handler and row_handler != handler:
+                continue
+            if sheet_name and row_sheet != sheet_name:
+                continue
+            if op and row_op != op:
+                continue
+
+            calls = stat["calls"]
+            rows.append({
+                "handler": row_handler,
+                "sheet": row_sheet,
+                "op": row_op,
+                "calls": calls,
+                "errors": stat["errors"],
+                "avg_ms": round(stat["total_ms"] / calls, 1),
+                "p95_ms": self._percentile(stat["buckets"], calls, 0.95),
+                "max_ms": round(stat["max_ms"], 1),
+                "histogram": dict(zip(self.BUCKETS_MS, stat["buckets"])),
+            })
+
+        rows.sort(key=lambda row: row["calls"], reverse=True)
+        return rows
+
+    def calls_by_handler(self) -> Dict[str, int]:
+        """
+        Total API calls per handler, the quick "who eats our quota" view.
+        """
+        totals: Dict[str, int] = {}
+        for row in self.snapshot():
+            totals[row["handler"]] = totals.get(row["handler"], 0) + row["calls"]
+        return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
@@ -0,0 +1,158 @@
+import heapq
+import itertools
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from gspread.exceptions import APIError
+
+logger = logging.getLogger(__name__)
+
+# =====================================================
+# PRIORITIES (lower = served first)
+# =====================================================
+PRIORITY_USER = 0          # user is waiting: Order ID check, menu, payment
+PRIORITY_NORMAL = 1        # default
+PRIORITY_BACKGROUND = 2    # admin management, mirror refresh, write-behind
+
+_priority: ContextVar[int] = ContextVar("sheets_priority", default=PRIORITY_NORMAL)
+
+
+@contextmanager
+def sheets_priority(level: int) -> Iterator[None]:
+    """
+    Sets the scheduler priority for Sheets calls made inside the block.
+    Also usable as a decorator. Follows calls into the Sheets thread pool.
+    """
+    token = _priority.set(level)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class _TokenBucket:
+    def __init__(self, per_minute: float, burst: float):
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, burst)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.waiters: List[Tuple[int, int]] = []   # heap of (priority, seq)
+
+    def refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def wait_time(self) -> float:
+        return max(0.0, (1.0 - self.tokens) / self.rate)
+
+
+class SheetsScheduler:
+    """
+    Central gate for every Google Sheets API call.
+    - One token bucket per quota (read / write), tuned per minute
+    - Waiting calls are served by priority, then FIFO
+    - 429 / 5xx responses are retried with jittered exponential backoff
+      (appends are only retried on 429, a 5xx may already have written)
+    """
+
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+    def __init__(
+        self,
+        read_per_minute: float = 60,
+        write_per_minute: float = 60,
+        burst: float = 10,
+        max_retries: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 32.0,
+    ):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        self._buckets: Dict[str, _TokenBucket] = {
+            "read": _TokenBucket(read_per_minute, burst),
+            "write": _TokenBucket(write_per_minute, burst),
+        }
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+
+    # =====================================================
+    # QUOTA
+    # =====================================================
+    def _acquire(self, kind: str, priority: int) -> None:
+        bucket = self._buckets[kind]
+
+        with self._cond:
+            ticket = (priority, next(self._seq))
+            heapq.heappush(bucket.waiters, ticket)
+
+            try:
+                while True:
+                    bucket.refill()
+                    is_head = bucket.waiters[0] == ticket
+
+                    if is_head and bucket.tokens >= 1:
+                        bucket.tokens -= 1
+                        heapq.heappop(bucket.waiters)
+                        self._cond.notify_all()
+                        return
+
+                    # Only the head needs a timer, the rest wait their turn
+                    self._cond.wait(bucket.wait_time() if is_head else None)
+            except BaseException:
+                if ticket in bucket.waiters:
+                    bucket.waiters.remove(ticket)
+                    heapq.heapify(bucket.waiters)
+                self._cond.notify_all()
+                raise
+
+    # =====================================================
+    # RETRIES
+    # =====================================================
+    def _backoff(self, attempt: int) -> float:
+        # "Equal jitter": half fixed, half random
+        cap = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return cap / 2 + random.uniform(0, cap / 2)
+
+    def call(
+        self,
+        kind: str,
+        op: str,
+        func: Callable[..., Any],
+        *args,
+        idempotent: bool = True,
+        **kwargs,
+    ) -> Any:
+        """
+        Runs `func` once quota allows, retrying throttled / failed calls.
+        `kind` is "read" or "write", `op` is used for logging.
+        """
+        priority = _priority.get()
+        attempt = 0
+
+        while True:
+            self._acquire(kind, priority)
+
+            try:
+                return func(*args, **kwargs)
+            except APIError as e:
+                status = getattr(getattr(e, "response", None), "status_code", None)
+                retryable = status == 429 or (idempotent and status in self.RETRY_STATUSES)
+
+                if not retryable or attempt >= self.max_retries:
+                    raise
+
+                delay = self._backoff(attempt)
+                attempt += 1
+                logger.warning(
+                    "Sheets %s failed with %s, retry %s/%s in %.1fs",
+                    op, status, attempt, self.max_retries, delay,
+                )
+                time.sleep(delay)
@@ -0,0 +1,649 @@
+import abc
+import asyncio
+import contextvars
+import functools
+import json
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Protocol, Tuple
+
+from gspread.utils import numericise_all
+
+
+# =====================================================
+# VALUE HELPERS (shared by every backend)
+# =====================================================
+def fill_gaps(values: List[List[Any]]) -> List[List[Any]]:
+    """
+    Pads rows to the same width, like get_all_values().
+    """
+    width = max((len(row) for row in values), default=0)
+    return [list(row) + [""] * (width - len(row)) for row in values]
+
+
+def to_records(values: List[List[Any]]) -> List[Dict[str, Any]]:
+    """
+    Header row + raw values → dict rows, like get_all_records().
+    """
+    if len(values) < 2:
+        return []
+
+    headers = values[0]
+    return [
+        dict(zip(headers, numericise_all(list(row) + [""] * (len(headers) - len(row)))))
+        for row in values[1:]
+    ]
+
+
+def project_columns(
+    values: List[List[Any]],
+    columns: List[str],
+    start_row: int = 2,
+    end_row: Optional[int] = None,
+) -> List[List[Any]]:
+    """
+    Header row + raw values → only `columns` of rows start_row..end_row
+    (1-based, inclusive). Unknown columns come back as "".
+    """
+    headers = values[0] if values else []
+    index = {name: col for col, name in reversed(list(enumerate(headers)))}
+    cols = [index.get(column) for column in columns]
+
+    return [
+        [row[col] if col is not None and col < len(row) else "" for col in cols]
+        for row in values[max(start_row, 1) - 1:end_row]
+    ]
+
+
+def as_cell(value: Any) -> str:
+    # Sheets hands back formatted strings, local backends do the same
+    return "" if value is None else str(value)
+
+
+# =====================================================
+# STORAGE PROTOCOL
+# =====================================================
+class StorageBackend(Protocol):
+    """
+    What the services need from a tab-based store.
+    Implemented by GoogleSheetsService, SQLiteStorage and InMemoryStorage.
+    """
+
+    def read_sheet(self, sheet_name: str) -> List[Dict[str, Any]]: ...
+
+    def get_values(self, sheet_name: str) -> List[List[Any]]: ...
+
+    def read_many(self, sheet_names: List[str]) -> Dict[str, List[Dict[str, Any]]]: ...
+
+    def read_columns(
+        self,
+        sheet_name: str,
+        columns: List[str],
+        start_row: int = 2,
+        end_row: Optional[int] = None,
+    ) -> List[List[Any]]: ...
+
+    def get_column(
+        self,
+        sheet_name: str,
+        column_name: str,
+        start_row: int = 2,
+        end_row: Optional[int] = None,
+    ) -> List[Any]: ...
+
+    def iter_rows(
+        self,
+        sheet_name: str,
+        chunk_size: int = 500,
+        columns: Optional[List[str]] = None,
+        start_row: int = 2,
+    ) -> Iterator[List[Any]]: ...
+
+    def list_sheets(self) -> List[str]: ...
+
+    def get_header_row(self, sheet_name: str) -> List[str]: ...
+
+    def ensure_sheet(self, sheet_name: str, headers: List[str]) -> None: ...
+
+    def append_row(self, sheet_name: str, row: Dict[str, Any]) -> None: ...
+
+    def append_rows(self, sheet_name: str, rows: List[Dict[str, Any]]) -> None: ...
+
+    def update_row(self, sheet_name: str, row_index: int, updates: Dict[str, Any]) -> None: ...
+
+    def batch_update_rows(
+        self, sheet_name: str, patches: List[Tuple[int, Dict[str, Any]]]
+    ) -> None: ...
+
+    def patch_rows_where(
+        self, sheet_name: str, column_name: str, value: Any, updates: Dict[str, Any]
+    ) -> int: ...
+
+    def update(self, sheet_name: str, rows: List[Dict[str, Any]]) -> None: ...
+
+    def find_row_by_value(self, sheet_name: str, column_name: str, value: Any) -> Optional[int]: ...
+
+    async def run_async(self, func: Callable[..., Any], *args, **kwargs) -> Any: ...
+
+    def close(self) -> None: ...
+
+
+# =====================================================
+# ASYNC (NON-BLOCKING) API
+# =====================================================
+class AsyncStorageMixin:
+    """
+    Awaitable a* variants of the storage API.
+    Blocking calls run on a bounded thread pool
+    so handlers never block the event loop.
+    """
+
+    def _init_executor(self, max_workers: int) -> None:
+        # Pool is created on first use
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    async def run_async(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Runs a blocking call on the bounded storage thread pool.
+        The caller's contextvars (priority, handler tag) come along.
+        """
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="sheets",
+                )
+            executor = self._executor
+
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        call = functools.partial(context.run, func, *args, **kwargs)
+        return await loop.run_in_executor(executor, call)
+
+    async def aread_sheet(self, sheet_name: str) -> List[Dict[str, Any]]:
+        return await self.run_async(self.read_sheet, sheet_name)
+
+    async def aget_rows(self, sheet_name: str) -> List[Dict[str, Any]]:
+        return await self.run_async(self.get_rows, sheet_name)
+
+    async def aread_many(self, sheet_names: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        return await self.run_async(self.read_many, sheet_names)
+
+    async def aget_values(self, sheet_name: str) -> List[List[Any]]:
+        return await self.run_async(self.get_values, sheet_name)
+
+    async def aread_columns(
+        self,
+        sheet_name: str,
+        columns: List[str],
+        start_row: int = 2,
+        end_row: Optional[int] = None,
+    ) -> List[List[Any]]:
+        return await self.run_async(
+            self.read_columns, sheet_name, columns, start_row, end_row
+        )
+
+    async def aget_column(
+        self,
+        sheet_name: str,
+        column_name: str,
+        start_row: int = 2,
+        end_row: Optional[int] = None,
+    ) -> List[Any]:
+        return await self.run_async(
+            self.get_column, sheet_name, column_name, start_row, end_row
+        )
+
+    async def aappend_row(self, sheet_name: str, row: Dict[str, Any]) -> None:
+        await self.run_async(self.append_row, sheet_name, row)
+
+    async def aappend_rows(self, sheet_name: str, rows: List[Dict[str, Any]]) -> None:
+        await self.run_async(self.append_rows, sheet_name, rows)
+
+    async def aupdate_row(
+        self,
+        sheet_name: str,
+        row_index: int,
+        updates: Dict[str, Any],
+    ) -> None:
+        await self.run_async(self.update_row, sheet_name, row_index, updates)
+
+    async def abatch_update_rows(
+        self,
+        sheet_name: str,
+        patches: List[Tuple[int, Dict[str, Any]]],
+    ) -> None:
+        await self.run_async(self.batch_update_rows, sheet_name, patches)
+
+    async def aupdate(self, sheet_name: str, rows: List[Dict[str, Any]]) -> None:
+        await self.run_async(self.update, sheet_name, rows)
+
+    async def apatch_rows_where(
+        self,
+        sheet_name: str,
+        column_name: str,
+        value: Any,
+        updates: Dict[str, Any],
+    ) -> int:
+        return await self.run_async(
+            self.patch_rows_where, sheet_name, column_name, value, updates
+        )
+
+    async def afind_row_by_value(
+        self,
+        sheet_name: str,
+        column_name: str,
+        value: Any,
+    ) -> Optional[int]:
+        return await self.run_async(
+            self.find_row_by_value, sheet_name, column_name, value
+        )
+
+    def close(self) -> None:
+        """
+        Waits for in-flight async calls and stops the pool.
+        """
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+# =====================================================
+# LOCAL BACKENDS
+# =====================================================
+class LocalStorage(AsyncStorageMixin, abc.ABC):
+    """
+    Tab-based storage without network access.
+    Subclasses only provide raw value primitives,
+    row 1 of every tab is the header row (same as Sheets).
+    """
+
+    def __init__(self, max_workers: int = 8):
+        self._lock = threading.RLock()
+        self._init_executor(max_workers)
+
+    # -------------------------
+    # PRIMITIVES (1-based rows / cols)
+    # -------------------------
+    @abc.abstractmethod
+    def _read(self, sheet_name: str) -> List[List[str]]:
+        ...
+
+    @abc.abstractmethod
+    def _append(self, sheet_name: str, rows: List[List[str]]) -> None:
+        ...
+
+    @abc.abstractmethod
+    def _write_cells(self, sheet_name: str, cells: List[Tuple[int, int, str]]) -> None:
+        ...
+
+    @abc.abstractmethod
+    def _replace(self, sheet_name: str, values: List[List[str]]) -> None:
+        ...
+
+    def _read_range(self, sheet_name: str, start_row: int, end_row: int) -> List[List[str]]:
+        # Backends that can page natively override this
+        return self._read(sheet_name)[start_row - 1:end_row]
+
+    @abc.abstractmethod
+    def list_sheets(self) -> List[str]:
+        ...
+
+    def _header_index(self, sheet_name: str) -> Dict[str, int]:
+        values = self._read(sheet_name)
+        headers = values[0] if values else []
+        return {
+            name: col
+            for col, name in reversed(list(enumerate(headers, start=1)))
+        }
+
+    # -------------------------
+    # READ
+    # -------------------------
+    def get_values(self, sheet_name: str) -> List[List[Any]]:
+        return fill_gaps(self._read(sheet_name))
+
+    def read_sheet(self, sheet_name: str) -> List[Dict[str, Any]]:
+        return to_records(self._read(sheet_name))
+
+    def get_rows(self, sheet_name: str) -> List[Dict[str, Any]]:
+        return self.read_sheet(sheet_name)
+
+    def read_many(self, sheet_names: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        return {name: self.read_sheet(name) for name in sheet_names}
+
+    def read_columns(
+        self,
+        sheet_name: str,
+        columns: List[str],
+        start_row: int = 2,
+        end_row: Optional[int] = None,
+    ) -> List[List[Any]]:
+        return project_columns(self._read(sheet_name), columns, start_row, end_row)
+
+    def get_column(
+        self,
+        sheet_name: str,
+        column_name: str,
+        start_row: int = 2,
+        end_row: Optional[int] = None,
+    ) -> List[Any]:
+        return [
+            row[0]
+            for row in self.read_columns(sheet_name, [column_name], start_row, end_row)
+        ]
+
+    def iter_rows(
+        self,
+        sheet_name: str,
+        chunk_size: int = 500,
+        columns: Optional[List[str]] = None,
+        start_row: int = 2,
+    ) -> Iterator[List[Any]]:
+        headers = self._read_range(sheet_name, 1, 1)
+        headers = headers[0] if headers else []
+
+        start = start_row
+        while True:
+            end = start + chunk_size - 1
+            chunk = self._read_range(sheet_name, start, end)
+
+            if columns:
+                # Header row on top so project_columns can resolve names
+                chunk = project_columns([headers] + chunk, list(columns))
+            else:
+                chunk = [list(row) + [""] * (len(headers) - len(row)) for row in chunk]
+
+            yield from chunk
+
+            if len(chunk) < chunk_size:
+                return
+            start = end + 1
+
+    def find_row_by_value(
+        self,
+        sheet_name: str,
+        column_name: str,
+        value: Any,
+    ) -> Optional[int]:
+        col = self._header_index(sheet_name).get(column_name)
+        if not col:
+            return None
+
+        target = str(value)
+        for row_index, row in enumerate(self._read(sheet_name)[1:], start=2):
+            if len(row) >= col and row[col - 1] == target:
+                return row_index
+
+        return None
+
+    def get_header_row(self, sheet_name: str) -> List[str]:
+        header = self._read_range(sheet_name, 1, 1)
+        return list(header[0]) if header else []
+
+    # -------------------------
+    # WRITE
+    # -------------------------
+    def ensure_sheet(self, sheet_name: str, headers: List[str]) -> None:
+        # Local tabs exist once they hold a row
+        with self._lock:
+            if headers and not self._read_range(sheet_name, 1, 1):
+                self._append(sheet_name, [[as_cell(h) for h in headers]])
+
+    def append_row(self, sheet_name: str, row: Dict[str, Any]) -> None:
+        self.append_rows(sheet_name, [row])
+
+    def append_rows(self, sheet_name: str, rows: List[Dict[str, Any]]) -> None:
+        if not rows:
+            return
+
+        with self._lock:
+            values = self._read(sheet_name)
+            headers = values[0] if values else []
+
+            # Auto-create header if empty
+            if not headers:
+                headers = list(rows[0].keys())
+                self._append(sheet_name, [headers])
+
+            self._append(
+                sheet_name,
+                [[as_cell(row.get(header, "")) for header in headers] for row in rows],
+            )
+
+    def update_row(
+        self,
+        sheet_name: str,
+        row_index: int,
+        updates: Dict[str, Any],
+    ) -> None:
+        self.batch_update_rows(sheet_name, [(row_index, updates)])
+
+    def batch_update_rows(
+        self,
+        sheet_name: str,
+        patches: List[Tuple[int, Dict[str, Any]]],
+    ) -> None:
+        with self._lock:
+            index = self._header_index(sheet_name)
+            cells = [
+                (row_index, index[column], as_cell(value))
+                for row_index, updates in patches
+                for column, value in updates.items()
+                if column in index
+            ]
+            if cells:
+                self._write_cells(sheet_name, cells)
+
+    def patch_rows_where(
+        self,
+        sheet_name: str,
+        column_name: str,
+        value: Any,
+        updates: Dict[str, Any],
+    ) -> int:
+        with self._lock:
+            col = self._header_index(sheet_name).get(column_name)
+            if not col:
+                return 0
+
+            target = str(value).strip()
+            row_indexes = [
+                row_index
+                for row_index, row in enumerate(self._read(sheet_name)[1:], start=2)
+                if len(row) >= col and row[col - 1].strip() == target
+            ]
+
+            self.batch_update_rows(
+                sheet_name,
+                [(row_index, updates) for row_index in row_indexes],
+            )
+            return len(row_indexes)
+
+    def update(self, sheet_name: str, rows: List[Dict[str, Any]]) -> None:
+        if not rows:
+            return
+
+        headers = list(rows[0].keys())
+        values = [headers] + [
+            [as_cell(row.get(h, "")) for h in headers] for row in rows
+        ]
+
+        with self._lock:
+            self._replace(sheet_name, values)
+
+    # -------------------------
+    # SEED DATA
+    # -------------------------
+    def seed(self, tabs: Dict[str, List[Dict[str, Any]]]) -> None:
+        """
+        Fills empty tabs with dict rows, e.g. from a JSON fixture.
+        Tabs that already hold data are left alone.
+        """
+        for sheet_name, rows in tabs.items():
+            if not self._read(sheet_name):
+                self.update(sheet_name, rows)
+
+    def seed_from_file(self, path: str) -> None:
+        with open(path, encoding="utf-8") as fixture:
+            self.seed(json.load(fixture))
+
+
+class InMemoryStorage(LocalStorage):
+    """
+    Process-local store for tests and load tests. Nothing is persisted.
+    """
+
+    def __init__(self, max_workers: int = 8):
+        super().__init__(max_workers=max_workers)
+        self._tabs: Dict[str, List[List[str]]] = {}
+
+    def _read(self, sheet_name: str) -> List[List[str]]:
+        with self._lock:
+            return [list(row) for row in self._tabs.get(sheet_name, [])]
+
+    def _read_range(self, sheet_name: str, start_row: int, end_row: int) -> List[List[str]]:
+        with self._lock:
+            return [list(row) for row in self._tabs.get(sheet_name, [])[start_row - 1:end_row]]
+
+    def list_sheets(self) -> List[str]:
+        with self._lock:
+            return [name for name, values in self._tabs.items() if values]
+
+    def _append(self, sheet_name: str, rows: List[List[str]]) -> None:
+        with self._lock:
+            self._tabs.setdefault(sheet_name, []).extend(list(row) for row in rows)
+
+    def _write_cells(self, sheet_name: str, cells: List[Tuple[int, int, str]]) -> None:
+        with self._lock:
+            values = self._tabs.setdefault(sheet_name, [])
+            for row_index, col_index, value in cells:
+                while len(values) < row_index:
+                    values.append([])
+                row = values[row_index - 1]
+                while len(row) < col_index:
+                    row.append("")
+                row[col_index - 1] = value
+
+    def _replace(self, sheet_name: str, values: List[List[str]]) -> None:
+        with self._lock:
+            self._tabs[sheet_name] = [list(row) for row in values]
+
+
+class SQLiteStorage(LocalStorage):
+    """
+    Single-file local store, one table row per sheet row.
+    Suited for shops that keep the Orders ledger off Sheets.
+    """
+
+    def __init__(self, db_path: str, max_workers: int = 8):
+        super().__init__(max_workers=max_workers)
+        self.db_path = db_path
+
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS sheet_rows ("
+            " sheet TEXT NOT NULL,"
+            " idx INTEGER NOT NULL,"
+            " row_json TEXT NOT NULL,"
+            " PRIMARY KEY (sheet, idx))"
+        )
+        self._db.commit()
+
+    def _read(self, sheet_name: str) -> List[List[str]]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT idx, row_json FROM sheet_rows WHERE sheet = ? ORDER BY idx",
+                (sheet_name,),
+            ).fetchall()
+
+        values: List[List[str]] = []
+        for idx, row_json in rows:
+            # Keep gaps left by cell writes past the last row
+            while len(values) < idx - 1:
+                values.append([])
+            values.append(json.loads(row_json))
+        return values
+
+    def _read_range(self, sheet_name: str, start_row: int, end_row: int) -> List[List[str]]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT idx, row_json FROM sheet_rows"
+                " WHERE sheet = ? AND idx BETWEEN ? AND ? ORDER BY idx",
+                (sheet_name, start_row, end_row),
+            ).fetchall()
+
+        values: List[List[str]] = []
+        for idx, row_json in rows:
+            while len(values) < idx - start_row:
+                values.append([])
+            values.append(json.loads(row_json))
+        return values
+
+    def list_sheets(self) -> List[str]:
+        with self._lock:
+            rows = self._db.execute("SELECT DISTINCT sheet FROM sheet_rows").fetchall()
+        return [sheet for (sheet,) in rows]
+
+    def _append(self, sheet_name: str, rows: List[List[str]]) -> None:
+        with self._lock:
+            (last,) = self._db.execute(
+                "SELECT COALESCE(MAX(idx), 0) FROM sheet_rows WHERE sheet = ?",
+                (sheet_name,),
+            ).fetchone()
+            self._db.executemany(
+                "INSERT INTO sheet_rows (sheet, idx, row_json) VALUES (?, ?, ?)",
+                [
+                    (sheet_name, last + offset, json.dumps(row))
+                    for offset, row in enumerate(rows, start=1)
+                ],
+            )
+            self._db.commit()
+
+    def _write_cells(self, sheet_name: str, cells: List[Tuple[int, int, str]]) -> None:
+        with self._lock:
+            by_row: Dict[int, List[Tuple[int, str]]] = {}
+            for row_index, col_index, value in cells:
+                by_row.setdefault(row_index, []).append((col_index, value))
+
+            for row_index, row_cells in by_row.items():
+                found = self._db.execute(
+                    "SELECT row_json FROM sheet_rows WHERE sheet = ? AND idx = ?",
+                    (sheet_name, row_index),
+                ).fetchone()
+                row = json.loads(found[0]) if found else []
+
+                for col_index, value in row_cells:
+                    while len(row) < col_index:
+                        row.append("")
+                    row[col_index - 1] = value
+
+                self._db.execute(
+                    "INSERT OR REPLACE INTO sheet_rows (sheet, idx, row_json) VALUES (?, ?, ?)",
+                    (sheet_name, row_index, json.dumps(row)),
+                )
+
+            self._db.commit()
+
+    def _replace(self, sheet_name: str, values: List[List[str]]) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM sheet_rows WHERE sheet = ?", (sheet_name,))
+            self._db.executemany(
+                "INSERT INTO sheet_rows (sheet, idx, row_json) VALUES (?, ?, ?)",
+                [
+                    (sheet_name, idx, json.dumps(row))
+                    for idx, row in enumerate(values, start=1)
+                ],
+            )
+            self._db.commit()
+
+    def close(self) -> None:
+        super().close()
+
+        with self._lock:
+            self._db.close()
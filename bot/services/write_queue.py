@@ -0,0 +1,176 @@
+import json
+import logging
+import os
+import threading
+from collections import defaultdict
+from typing import Any, Dict, List
+
+from bot.services.storage import StorageBackend
+from bot.services.sheets_scheduler import PRIORITY_BACKGROUND, sheets_priority
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindQueue:
+    """
+    Write-behind buffer for append-only tabs (Orders, *_Payments).
+    - Every row is written to a local journal before it is acknowledged
+    - Rows are flushed as ONE values_append per tab,
+      every `flush_interval` seconds or once a tab holds `batch_size` rows
+    - The journal is replayed on start and flushed on close()
+    Delivery is at-least-once: a crash between a successful append
+    and the journal rewrite can replay those rows once more.
+    """
+
+    def __init__(
+        self,
+        sheets: StorageBackend,
+        journal_path: str,
+        flush_interval: float = 5.0,
+        batch_size: int = 50,
+    ):
+        self.sheets = sheets
+        self.journal_path = journal_path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+
+        self._pending: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._lock = threading.RLock()        # pending rows + journal file
+        self._flush_lock = threading.Lock()   # one flush at a time
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+
+        self._replay_journal()
+        self._journal = open(self.journal_path, "a", encoding="utf-8")
+
+        self._thread = threading.Thread(
+            target=self._run,
+            name="sheets-write-behind",
+            daemon=True,
+        )
+        self._thread.start()
+
+    # =====================================================
+    # JOURNAL
+    # =====================================================
+    def _replay_journal(self) -> None:
+        if not os.path.exists(self.journal_path):
+            return
+
+        with open(self.journal_path, encoding="utf-8") as journal:
+            for line in journal:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Torn last line after a crash mid-write
+                    logger.warning("Skipping corrupt journal line: %r", line)
+                    continue
+                self._pending[entry["sheet"]].append(entry["row"])
+
+        replayed = sum(len(rows) for rows in self._pending.values())
+        if replayed:
+            logger.info("Replayed %s unflushed row(s) from journal", replayed)
+
+    def _write_entry(self, sheet_name: str, row: Dict[str, Any]) -> None:
+        self._journal.write(json.dumps({"sheet": sheet_name, "row": row}, default=str) + "\n")
+        self._journal.flush()
+        os.fsync(self._journal.fileno())
+
+    def _rewrite_journal(self) -> None:
+        """
+        Replaces the journal with the rows that are still pending.
+        """
+        tmp_path = f"{self.journal_path}.tmp"
+
+        with open(tmp_path, "w", encoding="utf-8") as tmp:
+            for sheet_name, rows in self._pending.items():
+                for row in rows:
+                    tmp.write(json.dumps({"sheet": sheet_name, "row": row}, default=str) + "\n")
+            tmp.flush()
+            os.fsync(tmp.fileno())
+
+        self._journal.close()
+        os.replace(tmp_path, self.journal_path)
+        self._journal = open(self.journal_path, "a", encoding="utf-8")
+
+    # =====================================================
+    # PUBLIC API
+    # =====================================================
+    def enqueue(self, sheet_name: str, row: Dict[str, Any]) -> None:
+        """
+        Durably queues a row. Returns as soon as it is journaled.
+        """
+        row = dict(row)
+
+        with self._lock:
+            self._write_entry(sheet_name, row)
+            self._pending[sheet_name].append(row)
+            full = len(self._pending[sheet_name]) >= self.batch_size
+
+        if full:
+            self._wake.set()
+
+    def pending_rows(self, sheet_name: str) -> List[Dict[str, Any]]:
+        """
+        Rows accepted but not yet written to the sheet.
+        """
+        with self._lock:
+            return list(self._pending.get(sheet_name, []))
+
+    def flush(self) -> None:
+        """
+        Writes every pending tab with one append call each.
+        Failed tabs stay queued and are retried on the next flush.
+        """
+        with self._flush_lock:
+            with self._lock:
+                batches = {
+                    sheet_name: list(rows)
+                    for sheet_name, rows in self._pending.items()
+                    if rows
+                }
+
+            for sheet_name, rows in batches.items():
+                try:
+                    self.sheets.append_rows(sheet_name, rows)
+                except Exception as e:
+                    logger.error(
+                        "Write-behind flush failed for %s (%s rows): %s",
+                        sheet_name, len(rows), e,
+                    )
+                    continue
+
+                with self._lock:
+                    # Rows enqueued during the append stay queued
+                    del self._pending[sheet_name][:len(rows)]
+                    self._rewrite_journal()
+
+    def close(self) -> None:
+        """
+        Stops the background thread and flushes what is left.
+        """
+        self._stop.set()
+        self._wake.set()
+        self._thread.join()
+
+        self.flush()
+
+        with self._lock:
+            self._journal.close()
+
+    # =====================================================
+    # BACKGROUND LOOP
+    # =====================================================
+    @sheets_priority(PRIORITY_BACKGROUND)
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+
+            if self._stop.is_set():
+                break
+
+            self.flush()
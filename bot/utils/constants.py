@@ -124,6 +124,13 @@ STATE_USDT_TXID = 221
 STATE_ADD_ADMIN_ID = 1
 STATE_REMOVE_ADMIN_SELECT = 2
 
+# =========================
+# ROLES (resolved once per update)
+# =========================
+ROLE_USER = "user"
+ROLE_ADMIN = "admin"
+ROLE_ROOT = "root"
+
 # =========================
 # PAYMENT METHOD DISPLAY NAMES
 # =========================
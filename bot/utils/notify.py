@@ -1,29 +1,585 @@
-from telegram.error import BadRequest, Forbidden
+import asyncio
+import logging
+import time
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Set
+
+from telegram.error import BadRequest, Forbidden, RetryAfter
 from bot.services.admin_service import AdminService
+from bot.services.notification_outbox import NotificationOutbox
 
+logger = logging.getLogger(__name__)
 
-async def notify_all_admins(context, message: str):
+# Where admin alerts go
+NOTIFY_MODE_DM = "dm"         # one message per active admin
+NOTIFY_MODE_GROUP = "group"   # one message to the admin group chat
+NOTIFY_MODE_BOTH = "both"
+NOTIFY_MODES = (NOTIFY_MODE_DM, NOTIFY_MODE_GROUP, NOTIFY_MODE_BOTH)
+
+
+class AdminNotifier:
     """
-    Send message to all active admins.
+    Sends one message to every active admin, concurrently,
+    and/or once to the admin group chat (see NOTIFY_MODES).
+    - Global and per-chat send rates follow Telegram's limits
+      (~30 messages/s overall, ~1 message/s per chat)
+    - RetryAfter (flood control) is waited out and retried
+    - Chats that never started / blocked the bot are remembered and
+      skipped for `unreachable_ttl` seconds, or until the admin talks
+      to the bot again (mark_reachable); root admins get a report of
+      them every `report_interval` seconds
+    - With an outbox, notify() only commits the message locally;
+      a background worker delivers it, retrying with exponential
+      backoff and dead-lettering after `max_attempts`
+    - Group mode posts to `admin_chat_id` only: one send per alert
+      and no Admins lookup
+    - Digest mode (`digest_window` > 0, needs the outbox) folds order /
+      payment events into one message per admin per window; payments
+      of `urgent_usd` or more still go out at once
     Never crashes the caller.
     """
-    admin_service: AdminService = context.bot_data["admin_service"]
-    admins = admin_service.get_active_admins()
 
-    for admin in admins:
-        admin_id = admin.get("Telegram ID")
+    CHAIN_ICONS = {"BTC": "₿", "ETH": "Ξ", "USDT": "💵"}
+    DIGEST_MAX_IDS = 20
+    LAST_REPORT_KEY = "last_unreachable_report"
+
+    def __init__(
+        self,
+        admin_service: AdminService,
+        outbox: Optional[NotificationOutbox] = None,
+        global_per_second: float = 30.0,
+        per_chat_interval: float = 1.0,
+        max_retries: int = 3,
+        max_attempts: int = 8,
+        retry_base: float = 5.0,
+        idle_interval: float = 30.0,
+        digest_window: float = 0.0,
+        urgent_usd: float = 0.0,
+        mode: str = NOTIFY_MODE_DM,
+        admin_chat_id: Optional[int] = None,
+        unreachable_ttl: float = 21600.0,
+        report_interval: float = 86400.0,
+    ):
+        if mode not in NOTIFY_MODES:
+            raise ValueError(f"Unknown admin notify mode: {mode}")
+        if mode != NOTIFY_MODE_DM and not admin_chat_id:
+            raise ValueError(f"Admin notify mode {mode!r} needs an admin chat ID")
+
+        self.admin_service = admin_service
+        self.outbox = outbox
+        self.global_interval = 1.0 / global_per_second
+        self.per_chat_interval = per_chat_interval
+        self.max_retries = max_retries
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.idle_interval = idle_interval
+        self.digest_window = digest_window if outbox else 0.0
+        self.urgent_usd = urgent_usd
+        self.mode = mode
+        self.admin_chat_id = admin_chat_id
+        self.unreachable_ttl = unreachable_ttl
+        self.report_interval = report_interval
+
+        # chat ID → {error, since, retry_at} (unix times)
+        self._unreachable: Dict[int, Dict[str, Any]] = (
+            outbox.load_unreachable() if outbox else {}
+        )
+        # Persisted so restarts do not keep postponing the report;
+        # never reported → report soon after start if anything is cached
+        last_report = outbox.get_meta(self.LAST_REPORT_KEY) if outbox else None
+        self._last_report = float(last_report) if last_report else 0.0
+
+        # Next free send slot (monotonic time), global and per chat
+        self._next_global = 0.0
+        self._next_chat: Dict[int, float] = {}
+
+        self._wake: Optional[asyncio.Event] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._background: Set[asyncio.Task] = set()
+
+    # =====================================================
+    # RATE LIMIT
+    # =====================================================
+    async def _wait_for_slot(self, chat_id: int) -> None:
+        # Slots are reserved before sleeping: no await in between,
+        # so concurrent senders never take the same slot
+        now = time.monotonic()
+        slot = max(now, self._next_global, self._next_chat.get(chat_id, 0.0))
+
+        self._next_global = max(self._next_global, slot) + self.global_interval
+        self._next_chat[chat_id] = slot + self.per_chat_interval
+
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    @staticmethod
+    def _retry_delay(error: RetryAfter) -> float:
+        retry_after = error.retry_after
+        if isinstance(retry_after, timedelta):
+            return retry_after.total_seconds()
+        return float(retry_after)
+
+    # =====================================================
+    # UNREACHABLE CHATS
+    # =====================================================
+    @staticmethod
+    def _is_unreachable_error(error: Exception) -> bool:
+        # Forbidden: blocked / never started; BadRequest only for a missing chat
+        return isinstance(error, Forbidden) or "chat not found" in str(error).lower()
+
+    @staticmethod
+    def _is_parse_error(error: Exception) -> bool:
+        # Markup broken by user-supplied text (stray * _ ` in an address...)
+        return "can't parse entities" in str(error).lower()
+
+    def _skipped(self, chat_id: int) -> bool:
+        entry = self._unreachable.get(chat_id)
+        return entry is not None and entry["retry_at"] > time.time()
+
+    def mark_unreachable(self, chat_id: int, error: str) -> None:
+        now = time.time()
+        previous = self._unreachable.get(chat_id)
+        entry = {
+            "error": error,
+            "since": previous["since"] if previous else now,
+            "retry_at": now + self.unreachable_ttl,
+        }
+        self._unreachable[chat_id] = entry
+        if self.outbox:
+            self.outbox.save_unreachable(chat_id, entry)
+
+    def mark_reachable(self, chat_id: int) -> None:
+        """
+        Forgets a cached failure (the chat talked to the bot or a
+        send went through). Free when the chat was not cached.
+        """
+        if self._unreachable.pop(chat_id, None) is not None and self.outbox:
+            self.outbox.clear_unreachable(chat_id)
+
+    # =====================================================
+    # SEND
+    # =====================================================
+    async def _send_message(
+        self,
+        bot,
+        chat_id: int,
+        text: str,
+        parse_mode: Optional[str] = None,
+    ) -> None:
+        """
+        send_message, re-sent as plain text when Telegram cannot
+        parse the markup, so the alert is never lost to formatting.
+        """
+        try:
+            await bot.send_message(chat_id=chat_id, text=text, parse_mode=parse_mode)
+        except BadRequest as e:
+            if not parse_mode or not self._is_parse_error(e):
+                raise
+            logger.warning("Admin notify for %s sent as plain text: %s", chat_id, e)
+            await bot.send_message(chat_id=chat_id, text=text)
+
+    async def send(
+        self,
+        bot,
+        chat_id: int,
+        text: str,
+        parse_mode: Optional[str] = None,
+    ) -> bool:
+        """
+        Sends to one chat. Returns False when it could not be delivered.
+        """
+        if self._skipped(chat_id):
+            return False
+
+        for attempt in range(self.max_retries + 1):
+            await self._wait_for_slot(chat_id)
+
+            try:
+                await self._send_message(bot, chat_id, text, parse_mode)
+                self.mark_reachable(chat_id)
+                return True
+            except RetryAfter as e:
+                if attempt >= self.max_retries:
+                    break
+                await asyncio.sleep(self._retry_delay(e))
+            except (BadRequest, Forbidden) as e:
+                # ❌ Admin never started bot or blocked it
+                if self._is_unreachable_error(e):
+                    self.mark_unreachable(chat_id, str(e))
+                else:
+                    logger.error("Admin notify rejected for %s: %s", chat_id, e)
+                return False
+            except Exception as e:
+                logger.error("Admin notify failed for %s: %s", chat_id, e)
+                return False
+
+        logger.error("Admin notify for %s gave up after flood control", chat_id)
+        return False
+
+    async def _admin_chat_ids(self) -> List[int]:
+        chat_ids = []
+        for admin in await self.admin_service.aget_active_admins():
+            try:
+                chat_id = int(admin.get("Telegram ID"))
+            except (TypeError, ValueError):
+                continue
+            if not self._skipped(chat_id):
+                chat_ids.append(chat_id)
+        return list(dict.fromkeys(chat_ids))
+
+    def _targets(self) -> List[Optional[int]]:
+        """
+        Recipients of one alert; None stands for "every active admin".
+        """
+        targets: List[Optional[int]] = []
+        if self.mode in (NOTIFY_MODE_GROUP, NOTIFY_MODE_BOTH):
+            targets.append(self.admin_chat_id)
+        if self.mode in (NOTIFY_MODE_DM, NOTIFY_MODE_BOTH):
+            targets.append(None)
+        return targets
+
+    async def broadcast(self, bot, text: str, parse_mode: Optional[str] = None) -> int:
+        """
+        Sends `text` to every target at once, without the outbox.
+        Returns how many chats received it.
+        """
+        chat_ids = [target for target in self._targets() if target is not None]
+
+        if None in self._targets():
+            try:
+                chat_ids += await self._admin_chat_ids()
+            except Exception as e:
+                logger.error("Could not load admins for notification: %s", e)
+            chat_ids = list(dict.fromkeys(chat_ids))
+
+        results = await asyncio.gather(*(
+            self.send(bot, chat_id, text, parse_mode=parse_mode)
+            for chat_id in chat_ids
+        ))
+        return sum(results)
+
+    async def notify(
+        self,
+        bot,
+        text: str,
+        parse_mode: Optional[str] = None,
+        event: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        Queues `text` for the admins and returns at once.
+        - With an outbox: committed to disk, delivered by the worker
+        - Without: fanned out by a background task (lost on restart)
+        - `event` (kind "order" / "payment", order_id, chain, total_usd)
+          lets digest mode fold the alert into the next digest
+        """
+        if self.outbox:
+            if event and self.digest_window > 0 and not self._is_urgent(event):
+                self.outbox.buffer_event(event)
+            else:
+                for target in self._targets():
+                    self.outbox.enqueue(text, parse_mode, chat_id=target)
+            if self._wake:
+                self._wake.set()
+            return
+
+        task = asyncio.create_task(self.broadcast(bot, text, parse_mode))
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
 
+    # =====================================================
+    # DIGEST
+    # =====================================================
+    @staticmethod
+    def _usd(event: Dict[str, Any]) -> float:
         try:
-            await context.bot.send_message(
-                chat_id=int(admin_id),
-                text=message,
+            return float(event.get("total_usd") or 0)
+        except (TypeError, ValueError):
+            return 0.0
+
+    def _is_urgent(self, event: Dict[str, Any]) -> bool:
+        return (
+            event.get("kind") == "payment"
+            and self.urgent_usd > 0
+            and self._usd(event) >= self.urgent_usd
+        )
+
+    def _id_list(self, events: List[Dict[str, Any]]) -> str:
+        ids = [str(e.get("order_id")) for e in events if e.get("order_id")]
+        shown = ", ".join(ids[:self.DIGEST_MAX_IDS])
+        if len(ids) > self.DIGEST_MAX_IDS:
+            shown += f" (+{len(ids) - self.DIGEST_MAX_IDS} more)"
+        return shown
+
+    def render_digest(self, events: List[Dict[str, Any]]) -> str:
+        """
+        One plain-text summary of buffered events:
+        counts, Order IDs and payment totals per chain.
+        """
+        orders = [e for e in events if e.get("kind") == "order"]
+        payments = [e for e in events if e.get("kind") == "payment"]
+
+        started = min(e.get("created_at") or time.time() for e in events)
+        lines = [
+            f"📊 Admin digest: {len(events)} event(s) since "
+            f"{time.strftime('%H:%M', time.gmtime(started))} UTC"
+        ]
+
+        if orders:
+            lines += ["", f"📦 New orders: {len(orders)}", self._id_list(orders)]
+
+        if payments:
+            lines += ["", f"💳 Payments submitted: {len(payments)}"]
+
+            by_chain: Dict[str, List[Dict[str, Any]]] = {}
+            for event in payments:
+                by_chain.setdefault(str(event.get("chain") or "?"), []).append(event)
+
+            for chain, items in by_chain.items():
+                total = sum(self._usd(e) for e in items)
+                icon = self.CHAIN_ICONS.get(chain, "•")
+                lines.append(f"{icon} {chain}: {len(items)} · {total:.2f} USD")
+
+            lines.append(self._id_list(payments))
+
+        return "\n".join(lines)
+
+    def _digest_due_at(self) -> Optional[float]:
+        if self.digest_window <= 0:
+            return None
+        oldest = self.outbox.oldest_event_at()
+        return None if oldest is None else oldest + self.digest_window
+
+    def _flush_digest(self) -> None:
+        due_at = self._digest_due_at()
+        if due_at is not None and due_at <= time.time():
+            folded = self.outbox.flush_events(self.render_digest, self._targets())
+            logger.info("Admin digest queued (%s events)", folded)
+
+    # =====================================================
+    # UNREACHABLE REPORT
+    # =====================================================
+    def _report_due_at(self) -> Optional[float]:
+        # Nothing to report → nothing to wake up for
+        if self.report_interval <= 0 or not self._unreachable:
+            return None
+        return self._last_report + self.report_interval
+
+    def render_unreachable_report(
+        self,
+        entries: Dict[int, Dict[str, Any]],
+        names: Dict[int, str],
+    ) -> str:
+        lines = [f"🚫 Unreachable admin chats: {len(entries)}", ""]
+        for chat_id, entry in sorted(entries.items(), key=lambda item: item[1]["since"]):
+            since = time.strftime("%Y-%m-%d %H:%M", time.gmtime(entry["since"]))
+            name = names.get(chat_id)
+            label = f"{chat_id} ({name})" if name else str(chat_id)
+            lines.append(f"• {label}, since {since} UTC: {entry['error']}")
+        lines += [
+            "",
+            "Alerts skip them until they message the bot "
+            "(/start, or unblock it first) or the retry period ends.",
+        ]
+        return "\n".join(lines)
+
+    async def _report_unreachable(self, bot) -> None:
+        due_at = self._report_due_at()
+        if due_at is None or due_at > time.time():
+            return
+
+        self._last_report = time.time()
+        if self.outbox:
+            self.outbox.set_meta(self.LAST_REPORT_KEY, str(self._last_report))
+
+        admins = await self.admin_service.aget_active_admins()
+        names: Dict[int, str] = {}
+        roots: List[int] = []
+        for admin in admins:
+            try:
+                chat_id = int(admin.get("Telegram ID"))
+            except (TypeError, ValueError):
+                continue
+            username = str(admin.get("Username") or "").strip()
+            names[chat_id] = f"@{username.lstrip('@')}" if username else ""
+            if str(admin.get("Type", "")).strip().lower() == "root":
+                roots.append(chat_id)
+
+        if self.admin_service.emergency_root_id:
+            roots.append(self.admin_service.emergency_root_id)
+        if self.admin_chat_id:
+            names[self.admin_chat_id] = "admin group"
+
+        # Admins disabled since they failed are no longer of interest
+        entries = {
+            chat_id: entry
+            for chat_id, entry in self._unreachable.items()
+            if chat_id in names
+        }
+        if not entries:
+            return
+
+        text = self.render_unreachable_report(entries, names)
+        roots = [chat_id for chat_id in dict.fromkeys(roots) if not self._skipped(chat_id)]
+
+        if self.outbox:
+            for chat_id in roots:
+                self.outbox.enqueue(text, chat_id=chat_id)
+        else:
+            await asyncio.gather(*(self.send(bot, chat_id, text) for chat_id in roots))
+
+    async def _report_loop(self, bot) -> None:
+        # Without an outbox the report is the only periodic job
+        while True:
+            try:
+                await self._report_unreachable(bot)
+            except Exception as e:
+                logger.error("Unreachable admins report failed: %s", e)
+
+            due_at = self._report_due_at()
+            timeout = self.idle_interval if due_at is None else due_at - time.time()
+            await asyncio.sleep(max(1.0, min(timeout, self.idle_interval)))
+
+    # =====================================================
+    # OUTBOX WORKER
+    # =====================================================
+    def _dead_letter(self, message: Dict[str, Any], error: str) -> None:
+        logger.error(
+            "Admin notification %s to %s dead-lettered: %s",
+            message["id"], message["chat_id"], error,
+        )
+        self.outbox.mark_dead(message["id"], error)
+
+    def _retry_later(
+        self,
+        message: Dict[str, Any],
+        error: str,
+        delay: Optional[float] = None,
+    ) -> None:
+        attempts = message["attempts"] + 1
+        if attempts >= self.max_attempts:
+            self._dead_letter(message, f"{error} (after {attempts} attempts)")
+            return
+
+        if delay is None:
+            delay = self.retry_base * 2 ** message["attempts"]
+        self.outbox.mark_retry(message["id"], error, delay)
+
+    async def _deliver(self, bot, message: Dict[str, Any]) -> None:
+        if self._skipped(message["chat_id"]):
+            self._dead_letter(message, "unreachable (cached)")
+            return
+
+        await self._wait_for_slot(message["chat_id"])
+
+        try:
+            await self._send_message(
+                bot, message["chat_id"], message["text"], message["parse_mode"]
             )
-        except (BadRequest, Forbidden):
-            # ❌ Admin never started bot or blocked it
-            # We silently ignore to avoid crashing flows
-            continue
+        except RetryAfter as e:
+            self._retry_later(message, "flood control", self._retry_delay(e))
+        except (BadRequest, Forbidden) as e:
+            # ❌ Will not succeed on retry (bot blocked / never started)
+            if self._is_unreachable_error(e):
+                self.mark_unreachable(message["chat_id"], str(e))
+            self._dead_letter(message, str(e))
         except Exception as e:
-            # Log but never crash
-            context.application.logger.error(
-                f"Admin notify failed for {admin_id}: {e}"
+            self._retry_later(message, str(e))
+        else:
+            self.outbox.mark_sent(message["id"])
+            self.mark_reachable(message["chat_id"])
+
+    async def _drain(self, bot) -> None:
+        while True:
+            messages = self.outbox.due()
+            if not messages:
+                return
+
+            broadcasts = [m for m in messages if m["chat_id"] is None]
+            direct = [m for m in messages if m["chat_id"] is not None]
+
+            if broadcasts:
+                try:
+                    chat_ids = await self._admin_chat_ids()
+                except Exception as e:
+                    logger.error("Could not load admins for notification: %s", e)
+                    for message in broadcasts:
+                        self._retry_later(message, str(e))
+                else:
+                    # Per-admin rows are picked up by the next due()
+                    for message in broadcasts:
+                        self.outbox.expand(message["id"], chat_ids)
+
+            await asyncio.gather(*(self._deliver(bot, m) for m in direct))
+
+    async def _run(self, bot) -> None:
+        while True:
+            timeout = self.idle_interval
+            try:
+                self._flush_digest()
+                await self._report_unreachable(bot)
+                await self._drain(bot)
+
+                due = (self.outbox.next_due_at(), self._digest_due_at(), self._report_due_at())
+                for due_at in due:
+                    if due_at is not None:
+                        timeout = min(timeout, max(0.0, due_at - time.time()))
+            except Exception as e:
+                logger.error("Admin outbox worker failed: %s", e)
+
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    def start(self, bot) -> None:
+        """
+        Starts the outbox worker (call from the running event loop).
+        Messages left over from the last run are delivered first.
+        Without an outbox only the unreachable-admins report runs.
+        """
+        if self._worker:
+            return
+
+        if not self.outbox:
+            if self.report_interval > 0:
+                self._worker = asyncio.create_task(self._report_loop(bot))
+            return
+
+        counts = self.outbox.counts()
+        if any(counts.values()):
+            logger.info(
+                "Admin outbox: %s pending, %s dead-lettered",
+                counts["pending"], counts["dead"],
             )
+
+        self._wake = asyncio.Event()
+        self._worker = asyncio.create_task(self._run(bot))
+
+    async def close(self) -> None:
+        """
+        Stops the worker. Undelivered messages stay in the outbox
+        (a send cut off mid-flight may be repeated on the next start).
+        """
+        if self._worker:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+        if self._background:
+            await asyncio.gather(*self._background, return_exceptions=True)
+
+        if self.outbox:
+            self.outbox.close()
+
+
+async def notify_all_admins(context, message: str):
+    """
+    Send message to all active admins.
+    Never crashes the caller.
+    """
+    notifier: AdminNotifier = context.bot_data["notifier"]
+    await notifier.notify(context.bot, message)
@@ -0,0 +1,37 @@
+import functools
+from typing import Iterable
+
+from telegram.ext import BaseHandler, ConversationHandler
+
+from bot.services.sheets_metrics import handler_tag
+
+
+def _tag_callback(handler: BaseHandler) -> None:
+    callback = handler.callback
+    if getattr(callback, "__sheets_tagged__", False):
+        return
+
+    name = getattr(callback, "__name__", type(handler).__name__)
+
+    @functools.wraps(callback)
+    async def tagged(update, context):
+        with handler_tag(name):
+            return await callback(update, context)
+
+    tagged.__sheets_tagged__ = True
+    handler.callback = tagged
+
+
+def instrument_handlers(handlers: Iterable[BaseHandler]) -> None:
+    """
+    Tags Sheets calls made by each handler callback with its name
+    (see SheetsMetrics). Walks into ConversationHandler states.
+    """
+    for handler in handlers:
+        if isinstance(handler, ConversationHandler):
+            instrument_handlers(handler.entry_points)
+            for state_handlers in handler.states.values():
+                instrument_handlers(state_handlers)
+            instrument_handlers(handler.fallbacks)
+        elif hasattr(handler, "callback"):
+            _tag_callback(handler)
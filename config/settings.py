@@ -1,8 +1,9 @@
 import os
 from dotenv import load_dotenv
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 
 from bot.services.google_sheets import GoogleSheetsService
+from bot.services.storage import StorageBackend
 
 load_dotenv()
 
@@ -14,28 +15,118 @@ class Settings:
     - Loads dynamic values from Google Sheets (Settings tab)
     """
 
-    def __init__(self):
+    def __init__(self, load_dynamic: bool = True):
         # ===== ENV VALUES (STATIC) =====
         self.BOT_TOKEN = self._require_env("BOT_TOKEN")
         self.ADMIN_CHAT_ID = int(self._require_env("ADMIN_CHAT_ID"))
 
-        self.GOOGLE_SHEET_ID = self._require_env("GOOGLE_SHEET_ID")
-        self.SERVICE_ACCOUNT_JSON_PATH = self._require_env(
-            "SERVICE_ACCOUNT_JSON_PATH"
-        )
+        # Updates of different users processed at the same time
+        # (a single user's updates always run one at a time)
+        self.BOT_CONCURRENT_UPDATES = self._env_int("BOT_CONCURRENT_UPDATES", 32)
+
+        # Storage backend: sheets (default) | sqlite | memory
+        self.STORAGE_BACKEND = (os.getenv("STORAGE_BACKEND") or "sheets").strip().lower()
+        self.STORAGE_SQLITE_PATH = os.getenv("STORAGE_SQLITE_PATH") or "bot_storage.sqlite3"
+        # Optional JSON fixture {"Settings": [...], "Admins": [...]} for local backends
+        self.STORAGE_SEED_PATH = os.getenv("STORAGE_SEED_PATH") or None
+
+        # Google credentials are only needed for the Sheets backend
+        if self.STORAGE_BACKEND == "sheets":
+            self.GOOGLE_SHEET_ID = self._require_env("GOOGLE_SHEET_ID")
+            self.SERVICE_ACCOUNT_JSON_PATH = self._require_env(
+                "SERVICE_ACCOUNT_JSON_PATH"
+            )
+        else:
+            self.GOOGLE_SHEET_ID = os.getenv("GOOGLE_SHEET_ID")
+            self.SERVICE_ACCOUNT_JSON_PATH = os.getenv("SERVICE_ACCOUNT_JSON_PATH")
 
         self.EMERGENCY_ROOT_ADMIN_ID = os.getenv(
             "EMERGENCY_ROOT_ADMIN_ID"
         )
 
-        # ===== GOOGLE SHEETS (DYNAMIC) =====
-        self._sheets_service = GoogleSheetsService(
-            sheet_id=self.GOOGLE_SHEET_ID,
-            service_account_path=self.SERVICE_ACCOUNT_JSON_PATH,
+        # Seconds the in-memory Admins index is trusted before a re-read
+        self.ADMIN_CACHE_TTL = self._env_float("ADMIN_CACHE_TTL", 60.0)
+
+        # Seconds Live Menu rows are reused before InventoryList is read again
+        self.MENU_CACHE_TTL = self._env_float("MENU_CACHE_TTL", 30.0)
+
+        # Admin alerts: dm (each active admin) | group (ADMIN_CHAT_ID) | both
+        self.ADMIN_NOTIFY_MODE = (os.getenv("ADMIN_NOTIFY_MODE") or "dm").strip().lower()
+
+        # Durable outbox for admin notifications (SQLite)
+        self.ADMIN_OUTBOX = self._env_bool("ADMIN_OUTBOX", True)
+        self.ADMIN_OUTBOX_PATH = os.getenv("ADMIN_OUTBOX_PATH") or "admin_outbox.db"
+        self.ADMIN_OUTBOX_MAX_ATTEMPTS = self._env_int("ADMIN_OUTBOX_MAX_ATTEMPTS", 8)
+        self.ADMIN_OUTBOX_RETRY_BASE = self._env_float("ADMIN_OUTBOX_RETRY_BASE", 5.0)
+
+        # Seconds an unreachable admin chat is skipped before it is tried again
+        self.ADMIN_UNREACHABLE_RETRY = self._env_float("ADMIN_UNREACHABLE_RETRY", 21600.0)
+        # Seconds between unreachable-admin reports to root admins (0 = off)
+        self.ADMIN_UNREACHABLE_REPORT_INTERVAL = self._env_float(
+            "ADMIN_UNREACHABLE_REPORT_INTERVAL", 86400.0
+        )
+
+        # Fold order / payment alerts into one digest per window (0 = off)
+        self.ADMIN_DIGEST_WINDOW = self._env_float("ADMIN_DIGEST_WINDOW", 0.0)
+        # Payments of this many USD or more skip the digest (0 = never)
+        self.ADMIN_DIGEST_URGENT_USD = self._env_float("ADMIN_DIGEST_URGENT_USD", 0.0)
+
+        # ===== GOOGLE SHEETS TUNING (OPTIONAL) =====
+        # Seconds a spreadsheet/worksheet handle is reused (0 = never)
+        self.SHEETS_HANDLE_TTL = self._env_float("SHEETS_HANDLE_TTL", 300.0)
+        # Worker threads for non-blocking Sheets calls from handlers
+        self.SHEETS_MAX_WORKERS = self._env_int("SHEETS_MAX_WORKERS", 8)
+        # Keep-alive connections in the shared authorized HTTP session
+        self.SHEETS_HTTP_POOL_SIZE = self._env_int("SHEETS_HTTP_POOL_SIZE", 10)
+
+        # Request scheduler (Sheets API per-minute quotas + retries)
+        self.SHEETS_READ_QUOTA_PER_MIN = self._env_float("SHEETS_READ_QUOTA_PER_MIN", 60)
+        self.SHEETS_WRITE_QUOTA_PER_MIN = self._env_float("SHEETS_WRITE_QUOTA_PER_MIN", 60)
+        self.SHEETS_QUOTA_BURST = self._env_float("SHEETS_QUOTA_BURST", 10)
+        self.SHEETS_MAX_RETRIES = self._env_int("SHEETS_MAX_RETRIES", 5)
+
+        # Rows per request when paging through the Orders ledger
+        self.SHEETS_SCAN_CHUNK_SIZE = self._env_int("SHEETS_SCAN_CHUNK_SIZE", 5000)
+
+        # Monthly Orders / *_Payments tabs (Orders_2026_10, ...), opt-in
+        self.SHEETS_MONTHLY_SHARDS = self._env_bool("SHEETS_MONTHLY_SHARDS", False)
+
+        # Write-behind for Orders / *_Payments appends
+        self.SHEETS_WRITE_BEHIND = self._env_bool("SHEETS_WRITE_BEHIND", False)
+        self.SHEETS_WRITE_BEHIND_INTERVAL = self._env_float(
+            "SHEETS_WRITE_BEHIND_INTERVAL", 5.0
+        )
+        self.SHEETS_WRITE_BEHIND_BATCH = self._env_int(
+            "SHEETS_WRITE_BEHIND_BATCH", 50
+        )
+        self.SHEETS_WRITE_BEHIND_JOURNAL = (
+            os.getenv("SHEETS_WRITE_BEHIND_JOURNAL") or "write_behind.jsonl"
         )
 
+        # Re-download tabs only when the spreadsheet's Drive revision changed
+        # (needs the Google Drive API enabled, opt-in)
+        self.SHEETS_REVISION_CHECK = self._env_bool("SHEETS_REVISION_CHECK", False)
+        self.SHEETS_REVISION_INTERVAL = self._env_float("SHEETS_REVISION_INTERVAL", 2.0)
+        self.SHEETS_REVISION_MAX_AGE = self._env_float("SHEETS_REVISION_MAX_AGE", 300.0)
+
+        # Local SQLite read-replica (disabled unless a path is set)
+        self.SHEETS_MIRROR_PATH = os.getenv("SHEETS_MIRROR_PATH") or None
+        self.SHEETS_MIRROR_MAX_STALENESS = self._env_float(
+            "SHEETS_MIRROR_MAX_STALENESS", 30.0
+        )
+        self.SHEETS_MIRROR_REFRESH_INTERVAL = self._env_float(
+            "SHEETS_MIRROR_REFRESH_INTERVAL", 15.0
+        )
+        self.SHEETS_MIRROR_TABS = self._env_list("SHEETS_MIRROR_TABS")
+
+        # ===== GOOGLE SHEETS (DYNAMIC) =====
+        # Shared storage is bound by main.py, see bind_storage()
+        self._sheets_service: Optional[StorageBackend] = None
+
         self.dynamic: Dict[str, Any] = {}
-        self.reload_dynamic_settings()
+        # Callers warming several tabs at once pass the rows in later
+        if load_dynamic:
+            self.reload_dynamic_settings()
 
     # -------------------------
     # ENV HELPERS
@@ -47,15 +138,63 @@ class Settings:
             raise RuntimeError(f"Missing required ENV variable: {key}")
         return value
 
+    @staticmethod
+    def _env_float(key: str, default: float) -> float:
+        value = os.getenv(key)
+        if not value:
+            return default
+        return float(value)
+
+    @staticmethod
+    def _env_int(key: str, default: int) -> int:
+        value = os.getenv(key)
+        if not value:
+            return default
+        return int(value)
+
+    @staticmethod
+    def _env_bool(key: str, default: bool) -> bool:
+        value = os.getenv(key)
+        if not value:
+            return default
+        return value.strip().lower() in ("1", "true", "yes", "on")
+
+    @staticmethod
+    def _env_list(key: str) -> List[str]:
+        value = os.getenv(key) or ""
+        return [item.strip() for item in value.split(",") if item.strip()]
+
+    # -------------------------
+    # STORAGE
+    # -------------------------
+    def bind_storage(self, storage: StorageBackend) -> None:
+        """
+        Reuse the application's storage instead of opening our own.
+        """
+        self._sheets_service = storage
+
+    def _storage(self) -> StorageBackend:
+        if self._sheets_service is None:
+            # Stand-alone use (no bound storage): own Sheets connection
+            self._sheets_service = GoogleSheetsService(
+                sheet_id=self.GOOGLE_SHEET_ID,
+                service_account_path=self.SERVICE_ACCOUNT_JSON_PATH,
+                handle_ttl=self.SHEETS_HANDLE_TTL,
+                pool_size=self.SHEETS_HTTP_POOL_SIZE,
+            )
+        return self._sheets_service
+
     # -------------------------
     # GOOGLE SHEETS SETTINGS
     # -------------------------
-    def reload_dynamic_settings(self) -> None:
+    def reload_dynamic_settings(self, rows: Optional[List[Dict[str, Any]]] = None) -> None:
         """
         Loads key-value pairs from the `Settings` sheet.
         Expected headers: key | value
+        Already fetched rows (e.g. from read_many) can be passed in.
         """
-        rows = self._sheets_service.read_sheet("Settings")
+        if rows is None:
+            rows = self._storage().read_sheet("Settings")
 
         settings = {}
         for row in rows:
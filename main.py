@@ -1,9 +1,15 @@
 # Entry point for the Telegram Bot
 import logging
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Tuple
 
+from telegram import Update
 from telegram.ext import (
     Application,
+    CommandHandler,
     ConversationHandler,
+    TypeHandler,
     CallbackQueryHandler,
     MessageHandler,
     filters,
@@ -15,7 +21,23 @@ from bot.services.admin_service import AdminService
 from bot.services.menu_service import MenuService
 from bot.services.order_service import OrderService
 from bot.services.settings_service import SettingsService  # ✅ NEW
+from bot.services.write_queue import WriteBehindQueue
+from bot.services.sheet_mirror import SheetMirror
+from bot.services.sheet_revisions import DriveRevisionSource
+from bot.services.sheets_scheduler import SheetsScheduler
+from bot.services.shards import ShardIndex
+from bot.services.notification_outbox import NotificationOutbox
+from bot.services.storage import (
+    InMemoryStorage,
+    LocalStorage,
+    SQLiteStorage,
+    StorageBackend,
+    to_records,
+)
 
+from bot.utils.notify import AdminNotifier
+from bot.utils.update_processor import PerUserUpdateProcessor
+from bot.handlers.middleware import resolve_role
 from bot.handlers.user import get_user_handlers
 from bot.handlers.admin import (
     open_admin_management,
@@ -24,7 +46,9 @@ from bot.handlers.admin import (
     start_remove_admin,
     finalize_remove_admin,
     list_admins,
+    sheets_stats,
 )
+from bot.utils.tracking import instrument_handlers
 
 from bot.utils.constants import (
     CB_ADMIN_MANAGEMENT,
@@ -46,19 +70,189 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# Tabs fetched together at startup
+WARM_UP_SHEETS = [
+    SettingsService.SHEET_NAME,
+    AdminService.SHEET_NAME,
+    MenuService.SHEET_NAME,
+]
+
+
 # -------------------------
-# MAIN ENTRY
+# STARTUP TIMINGS
 # -------------------------
-def main():
-    # 1️⃣ Load static settings (.env)
-    settings = Settings()
+class StartupTimer:
+    """
+    Per-phase startup timings, logged once the bot is ready to poll.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: List[Tuple[str, float]] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - started))
+
+    def log(self) -> None:
+        total = time.perf_counter() - self.started
+        breakdown = ", ".join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in self.phases)
+        logger.info("⏱ Startup took %.0fms (%s)", total * 1000, breakdown)
+
+
+# -------------------------
+# STORAGE
+# -------------------------
+def build_storage(settings: Settings) -> StorageBackend:
+    """
+    Picks the storage backend from STORAGE_BACKEND.
+    Local backends need no network (benchmarks / load tests).
+    """
+    if settings.STORAGE_BACKEND in ("memory", "sqlite"):
+        if settings.STORAGE_BACKEND == "memory":
+            storage: LocalStorage = InMemoryStorage(
+                max_workers=settings.SHEETS_MAX_WORKERS,
+            )
+        else:
+            storage = SQLiteStorage(
+                db_path=settings.STORAGE_SQLITE_PATH,
+                max_workers=settings.SHEETS_MAX_WORKERS,
+            )
+
+        if settings.STORAGE_SEED_PATH:
+            storage.seed_from_file(settings.STORAGE_SEED_PATH)
+
+        return storage
+
+    if settings.STORAGE_BACKEND != "sheets":
+        raise RuntimeError(f"Unknown STORAGE_BACKEND: {settings.STORAGE_BACKEND}")
 
-    # 2️⃣ Google Sheets service
     sheets_service = GoogleSheetsService(
         sheet_id=settings.GOOGLE_SHEET_ID,
         service_account_path=settings.SERVICE_ACCOUNT_JSON_PATH,
+        handle_ttl=settings.SHEETS_HANDLE_TTL,
+        max_workers=settings.SHEETS_MAX_WORKERS,
+        pool_size=settings.SHEETS_HTTP_POOL_SIZE,
+        scheduler=SheetsScheduler(
+            read_per_minute=settings.SHEETS_READ_QUOTA_PER_MIN,
+            write_per_minute=settings.SHEETS_WRITE_QUOTA_PER_MIN,
+            burst=settings.SHEETS_QUOTA_BURST,
+            max_retries=settings.SHEETS_MAX_RETRIES,
+        ),
     )
 
+    if settings.SHEETS_REVISION_CHECK:
+        sheets_service.attach_revision_source(
+            DriveRevisionSource(
+                session=sheets_service.session,
+                file_id=settings.GOOGLE_SHEET_ID,
+                min_interval=settings.SHEETS_REVISION_INTERVAL,
+                metrics=sheets_service.metrics,
+            ),
+            max_age=settings.SHEETS_REVISION_MAX_AGE,
+        )
+
+    if settings.SHEETS_MIRROR_PATH:
+        sheets_service.attach_mirror(
+            SheetMirror(
+                sheets=sheets_service,
+                db_path=settings.SHEETS_MIRROR_PATH,
+                max_staleness=settings.SHEETS_MIRROR_MAX_STALENESS,
+                refresh_interval=settings.SHEETS_MIRROR_REFRESH_INTERVAL,
+                tabs=settings.SHEETS_MIRROR_TABS,
+            )
+        )
+
+    return sheets_service
+
+
+# -------------------------
+# WARM-UP
+# -------------------------
+def apply_warm_tabs(application: Application, warm: Dict[str, List[Dict[str, Any]]]) -> None:
+    application.bot_data["settings"].reload_dynamic_settings(
+        warm[SettingsService.SHEET_NAME]
+    )
+    application.bot_data["admin_service"].prime(warm[AdminService.SHEET_NAME])
+    application.bot_data["menu_service"].prime(warm[MenuService.SHEET_NAME])
+
+
+async def refresh_warm_tabs(application: Application) -> None:
+    # Replaces last-known data served at startup with current data
+    try:
+        warm = await application.bot_data["sheets"].aread_many(WARM_UP_SHEETS)
+        apply_warm_tabs(application, warm)
+    except Exception as e:
+        logger.error("Background warm-up refresh failed: %s", e)
+
+
+async def on_startup(application: Application) -> None:
+    """
+    Loads the minimum data before polling starts:
+    Settings / Admins / InventoryList in one batch read.
+    A warm mirror serves them at once and is refreshed in the background.
+    """
+    timer: StartupTimer = application.bot_data.pop("startup_timer")
+    sheets_service = application.bot_data["sheets"]
+    mirror = getattr(sheets_service, "mirror", None)
+
+    with timer.phase("warm-up"):
+        cached = {name: mirror.peek(name) for name in WARM_UP_SHEETS} if mirror else {}
+
+        if cached and all(values is not None for values in cached.values()):
+            warm = {name: to_records(values) for name, values in cached.items()}
+            application.create_task(refresh_warm_tabs(application))
+        else:
+            warm = await sheets_service.aread_many(WARM_UP_SHEETS)
+
+        apply_warm_tabs(application, warm)
+
+    # Delivers admin notifications queued now and in the last run
+    application.bot_data["notifier"].start(application.bot)
+
+    timer.log()
+
+
+# -------------------------
+# SHUTDOWN
+# -------------------------
+async def on_shutdown(application: Application) -> None:
+    # Undelivered admin notifications stay in the outbox for the next run
+    await application.bot_data["notifier"].close()
+
+    # Flush queued rows first, then let in-flight Sheets calls finish
+    write_queue = application.bot_data.get("write_queue")
+    if write_queue:
+        write_queue.close()
+
+    sheets_service = application.bot_data["sheets"]
+    mirror = getattr(sheets_service, "mirror", None)
+    if mirror:
+        mirror.close()
+
+    sheets_service.close()
+
+
+# -------------------------
+# MAIN ENTRY
+# -------------------------
+def main():
+    timer = StartupTimer()
+
+    # 1️⃣ Load static settings (.env), Settings tab is warmed in on_startup
+    with timer.phase("env"):
+        settings = Settings(load_dynamic=False)
+
+    # 2️⃣ Storage (Google Sheets by default), shared with Settings.
+    # No network here: the first request happens during warm-up.
+    with timer.phase("storage"):
+        sheets_service = build_storage(settings)
+        settings.bind_storage(sheets_service)
+
     # 3️⃣ Dynamic settings service (Google Sheet → Settings)
     settings_service = SettingsService(sheets=sheets_service)  # ✅ NEW
 
@@ -66,27 +260,79 @@ def main():
     admin_service = AdminService(
         sheets=sheets_service,
         emergency_root_id=settings.EMERGENCY_ROOT_ADMIN_ID,
+        cache_ttl=settings.ADMIN_CACHE_TTL,
+    )
+
+    # Concurrent, rate-limited admin fan-out (shared by all handlers)
+    notifier = AdminNotifier(
+        admin_service,
+        outbox=NotificationOutbox(settings.ADMIN_OUTBOX_PATH) if settings.ADMIN_OUTBOX else None,
+        max_attempts=settings.ADMIN_OUTBOX_MAX_ATTEMPTS,
+        retry_base=settings.ADMIN_OUTBOX_RETRY_BASE,
+        digest_window=settings.ADMIN_DIGEST_WINDOW,
+        urgent_usd=settings.ADMIN_DIGEST_URGENT_USD,
+        mode=settings.ADMIN_NOTIFY_MODE,
+        admin_chat_id=settings.ADMIN_CHAT_ID,
+        unreachable_ttl=settings.ADMIN_UNREACHABLE_RETRY,
+        report_interval=settings.ADMIN_UNREACHABLE_REPORT_INTERVAL,
     )
 
     menu_service = MenuService(
         sheets=sheets_service,
         settings=settings,  # ⚠️ unchanged (backward compatible)
+        cache_ttl=settings.MENU_CACHE_TTL,
     )
 
+    write_queue = None
+    if settings.SHEETS_WRITE_BEHIND:
+        # Replays the local journal
+        with timer.phase("write-behind"):
+            write_queue = WriteBehindQueue(
+                sheets=sheets_service,
+                journal_path=settings.SHEETS_WRITE_BEHIND_JOURNAL,
+                flush_interval=settings.SHEETS_WRITE_BEHIND_INTERVAL,
+                batch_size=settings.SHEETS_WRITE_BEHIND_BATCH,
+            )
+
     order_service = OrderService(
         sheets=sheets_service,
+        write_queue=write_queue,
+        scan_chunk_size=settings.SHEETS_SCAN_CHUNK_SIZE,
+        shards=(
+            ShardIndex(sheets_service, ttl=settings.SHEETS_HANDLE_TTL)
+            if settings.SHEETS_MONTHLY_SHARDS else None
+        ),
     )
 
     # 5️⃣ Telegram application
-    application = Application.builder().token(settings.BOT_TOKEN).build()
+    with timer.phase("application"):
+        application = (
+            Application.builder()
+            .token(settings.BOT_TOKEN)
+            # One update at a time per user, different users in parallel
+            .concurrent_updates(PerUserUpdateProcessor(settings.BOT_CONCURRENT_UPDATES))
+            .post_init(on_startup)
+            .post_shutdown(on_shutdown)
+            .build()
+        )
 
     # 6️⃣ Inject shared services
     application.bot_data["settings"] = settings              # ✅ keep
     application.bot_data["settings_service"] = settings_service  # ✅ NEW
     application.bot_data["sheets"] = sheets_service
     application.bot_data["admin_service"] = admin_service
+    application.bot_data["notifier"] = notifier
     application.bot_data["menu_service"] = menu_service
     application.bot_data["order_service"] = order_service
+    application.bot_data["write_queue"] = write_queue
+    application.bot_data["startup_timer"] = timer
+
+    # --------------------------------------------------
+    # 🔐 ROLE MIDDLEWARE (group -1 runs before every handler)
+    # --------------------------------------------------
+    role_handler = TypeHandler(Update, resolve_role)
+    instrument_handlers([role_handler])
+    application.add_handler(role_handler, group=-1)
 
     # --------------------------------------------------
     # 7️⃣ ADMIN CONVERSATION HANDLER
@@ -129,22 +375,28 @@ def main():
         allow_reentry=True,
     )
 
+    instrument_handlers([admin_conversation])
     application.add_handler(admin_conversation)
 
     # --------------------------------------------------
     # 8️⃣ ADMIN BUTTON (NO STATE)
     # --------------------------------------------------
-    application.add_handler(
-        CallbackQueryHandler(
-            list_admins,
-            pattern=f"^{CB_LIST_ADMINS}$",
-        )
+    list_admins_handler = CallbackQueryHandler(
+        list_admins,
+        pattern=f"^{CB_LIST_ADMINS}$",
     )
+    instrument_handlers([list_admins_handler])
+    application.add_handler(list_admins_handler)
+
+    # Root-only: Sheets API calls per handler / tab / op
+    application.add_handler(CommandHandler("sheetstats", sheets_stats))
 
     # -------------------------
     # 9️⃣ USER HANDLERS
     # -------------------------
-    for handler in get_user_handlers():
+    user_handlers = get_user_handlers()
+    instrument_handlers(user_handlers)
+    for handler in user_handlers:
         application.add_handler(handler)
 
     # -------------------------